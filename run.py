@@ -0,0 +1,16 @@
+"""
+Entry point for running the MusicMidi application.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+# Make sure the project root is on the path
+project_root = Path(__file__).parent
+sys.path.append(str(project_root))
+
+from src.py_files.main import main
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""
+Numba kernels for the accompaniment generator.
+
+The section fill patterns live here as an integer-dispatched ladder, one
+branch per pattern id. Only arrays and scalars cross the njit boundary;
+pattern selection, the chordal layer and sorting stay in Python.
+"""
+
+import numpy as np
+from numba import njit
+
+N_FILL_PATTERNS = 3
+
+# No fill pattern emits more than two events per step.
+_MAX_EVENTS_PER_STEP = 2
+
+
+@njit(cache=True)
+def expand_section(pattern_id, section_start, section_end, key_root, scale,
+                   tempo_mult):
+    """Emit the fill events for one section.
+
+    Walks the per-second steps of the section and appends each pattern's
+    events into preallocated arrays, folding every note into the 36-84
+    range and truncating durations at the section boundary the way the
+    old per-event comprehension did. Returns (notes, times, durs, vels)
+    trimmed to the events actually emitted.
+    """
+    L = scale.shape[0]
+    n_steps = int(section_end - section_start)
+    cap = n_steps * _MAX_EVENTS_PER_STEP
+    notes = np.empty(cap, dtype=np.int64)
+    times = np.empty(cap, dtype=np.float64)
+    durs = np.empty(cap, dtype=np.float64)
+    vels = np.empty(cap, dtype=np.int64)
+
+    k = 0
+    for i in range(n_steps):
+        t = section_start + i
+        if pattern_id == 0:
+            note = key_root + scale[i % L]
+            if note < 36:
+                note += 12 * ((36 - note + 11) // 12)
+            if note > 84:
+                note -= 12 * ((note - 84 + 11) // 12)
+            adjusted = min(1.0 * tempo_mult, section_end - t)
+            if adjusted > 0:
+                notes[k] = note
+                times[k] = t
+                durs[k] = adjusted
+                vels[k] = 50
+                k += 1
+        elif pattern_id == 1:
+            if i % 2 == 0:
+                note = key_root
+                if note < 36:
+                    note += 12 * ((36 - note + 11) // 12)
+                if note > 84:
+                    note -= 12 * ((note - 84 + 11) // 12)
+                adjusted = min(2.0 * tempo_mult, section_end - t)
+                if adjusted > 0:
+                    notes[k] = note
+                    times[k] = t
+                    durs[k] = adjusted
+                    vels[k] = 45
+                    k += 1
+        else:
+            note = key_root + 12
+            if note < 36:
+                note += 12 * ((36 - note + 11) // 12)
+            if note > 84:
+                note -= 12 * ((note - 84 + 11) // 12)
+            adjusted = min(0.5 * tempo_mult, section_end - t)
+            if adjusted > 0:
+                notes[k] = note
+                times[k] = t
+                durs[k] = adjusted
+                vels[k] = 45
+                k += 1
+            note = key_root + 7
+            if note < 36:
+                note += 12 * ((36 - note + 11) // 12)
+            if note > 84:
+                note -= 12 * ((note - 84 + 11) // 12)
+            adjusted = min(0.5 * tempo_mult, section_end - (t + 0.5))
+            if adjusted > 0:
+                notes[k] = note
+                times[k] = t + 0.5
+                durs[k] = adjusted
+                vels[k] = 40
+                k += 1
+
+    return notes[:k], times[:k], durs[:k], vels[:k]
@@ -0,0 +1,212 @@
+"""
+Accompaniment generation for parsed songs.
+"""
+
+import bisect
+import logging
+import random
+from operator import attrgetter, itemgetter
+
+import numpy as np
+
+from src import _accompaniment_kernels
+from src.genre_manager import GenreManager
+
+logger = logging.getLogger(__name__)
+
+# Marking tables shared by every call instead of dict literals rebuilt
+# inside the conversion helpers.
+_DYNAMICS_MAP = {'pp': 30, 'p': 45, 'mp': 60, 'mf': 75, 'f': 90, 'ff': 105}
+_DURATIONS_MAP = {'whole': 4.0, 'half': 2.0, 'quarter': 1.0,
+                  'eighth': 0.5, 'sixteenth': 0.25}
+
+# Fill pattern ids within the kernel's dispatch ladder, shared by every
+# selection.
+_FILL_PATTERN_IDS = tuple(range(_accompaniment_kernels.N_FILL_PATTERNS))
+
+
+class AccompanimentGenerator:
+    """Generates accompaniment events for a parsed song."""
+
+    CHORD_NOTES = {
+        'major': [0, 4, 7],
+        'minor': [0, 3, 7],
+        'dim': [0, 3, 6],
+        'seventh': [0, 4, 7, 10]
+    }
+
+    PATTERNS = {
+        'basic': {
+            'notes': [
+                {'beat': 0.0, 'notes': ['C4'], 'duration': 'half', 'dynamic': 'mp'},
+                {'beat': 2.0, 'notes': ['C4', 'G4'], 'duration': 'half', 'dynamic': 'p'}
+            ]
+        },
+        'waltz': {
+            'notes': [
+                {'beat': 0.0, 'notes': ['C3'], 'duration': 'quarter', 'dynamic': 'mf'},
+                {'beat': 1.0, 'notes': ['C4', 'E4'], 'duration': 'quarter', 'dynamic': 'p'},
+                {'beat': 2.0, 'notes': ['C4', 'E4'], 'duration': 'quarter', 'dynamic': 'p'}
+            ]
+        },
+        'arpeggio': {
+            'notes': [
+                {'beat': 0.0, 'notes': ['C4'], 'duration': 'eighth', 'dynamic': 'mp'},
+                {'beat': 0.5, 'notes': ['E4'], 'duration': 'eighth', 'dynamic': 'p'},
+                {'beat': 1.0, 'notes': ['G4'], 'duration': 'eighth', 'dynamic': 'p'},
+                {'beat': 1.5, 'notes': ['C5'], 'duration': 'eighth', 'dynamic': 'p'}
+            ]
+        }
+    }
+
+    # Chord intervals as arrays, shared by the vectorized transposition in
+    # _apply_pattern.
+    _CHORD_OFFSETS = {name: np.asarray(offsets, dtype=np.int64)
+                      for name, offsets in CHORD_NOTES.items()}
+
+    def __init__(self):
+        self.genre_manager = GenreManager()
+        self._song_length = 0.0
+        # Flattened per-pattern arrays keyed by pattern identity; the
+        # class-level patterns are parsed once and reused across songs.
+        self._pattern_prep = {}
+        # One-slot index for _get_section_for_time, rebuilt only when a
+        # different sections list comes in.
+        self._section_index = None
+
+    def _parse_single_note(self, note_str):
+        """Parse a note token like 'C4' or 'Fs3' (sharp written as 's')."""
+        note_map = {'C': 0, 'D': 2, 'E': 4, 'F': 5, 'G': 7, 'A': 9, 'B': 11}
+        sharp = 's' in note_str[1:-1] or '#' in note_str
+        name = note_str[0].upper()
+        octave = int(note_str[-1])
+        return note_map[name] + (1 if sharp else 0) + (octave + 1) * 12
+
+    def _dynamic_to_velocity(self, dynamic):
+        """Convert a dynamic marking to a MIDI velocity."""
+        return _DYNAMICS_MAP.get(dynamic, 80)
+
+    def _duration_to_beats(self, duration):
+        """Convert a duration name to a beat count."""
+        return _DURATIONS_MAP.get(duration, 1.0)
+
+    def _get_section_for_time(self, time, sections):
+        """Find the section containing the given time, if any.
+
+        Binary search over start times instead of a linear scan; the
+        sorted index is cached per sections list, so repeated queries
+        during the chordal walk cost O(log n) each.
+        """
+        index = self._section_index
+        if index is None or index[0] is not sections:
+            ordered = sorted(sections, key=attrgetter('start_time'))
+            starts = [s.start_time for s in ordered]
+            index = self._section_index = (sections, starts, ordered)
+        i = bisect.bisect_right(index[1], time) - 1
+        # Adjacent sections share their boundary times, so scan left
+        # through the containing run to resolve a boundary query to the
+        # same section the old first-match linear scan returned.
+        ordered = index[2]
+        found = None
+        while i >= 0 and ordered[i].end_time >= time:
+            found = ordered[i]
+            i -= 1
+        return found
+
+    def _prepare_pattern(self, pattern):
+        """Flatten a pattern's notes into parallel numpy arrays.
+
+        Each row is one (beat, duration, velocity, semitone offset)
+        tuple, with chords already expanded one row per note token. The
+        patterns are class-level constants, so the arrays are computed
+        once per pattern and reused for every application.
+        """
+        prep = self._pattern_prep.get(id(pattern))
+        if prep is None:
+            beats, durs, vels, offs = [], [], [], []
+            for note_event in pattern['notes']:
+                duration = self._duration_to_beats(note_event['duration'])
+                velocity = self._dynamic_to_velocity(note_event['dynamic'])
+                for note_str in note_event['notes']:
+                    beats.append(note_event['beat'])
+                    durs.append(duration)
+                    vels.append(velocity)
+                    offs.append(self._parse_single_note(note_str) - 60)
+            prep = self._pattern_prep[id(pattern)] = (
+                np.asarray(beats, dtype=np.float64),
+                np.asarray(durs, dtype=np.float64),
+                np.asarray(vels, dtype=np.int64),
+                np.asarray(offs, dtype=np.int64))
+        return prep
+
+    def _apply_pattern(self, pattern, chord_notes, base_time):
+        """Transpose one pattern onto the given chord starting at base_time.
+
+        One broadcast produces every (pattern note x chord note) pair
+        instead of the old triple Python loop; the skip mask replaces the
+        per-event song-length test.
+        """
+        beats, durs, vels, offs = self._prepare_pattern(pattern)
+        keep = base_time + beats < self._song_length
+        if not keep.all():
+            beats, durs, vels, offs = beats[keep], durs[keep], vels[keep], offs[keep]
+        n = len(chord_notes)
+        notes = np.add.outer(offs, chord_notes).ravel()
+        times = np.repeat(base_time + beats, n)
+        durations = np.repeat(durs, n)
+        velocities = np.repeat(vels, n)
+        return list(zip(notes.tolist(), times.tolist(),
+                        durations.tolist(), velocities.tolist()))
+
+    def generate_pattern(self, song_data, style=None, genre=None):
+        """Generate accompaniment events for a parsed song."""
+        logger.info(f"Generating accompaniment in style: {style or 'basic'}")
+
+        sections = song_data.sections
+        notes = song_data.notes
+        if notes:
+            self._song_length = float(notes[-1]['time']) + float(notes[-1]['duration'])
+        elif sections:
+            self._song_length = sections[-1].end_time
+        else:
+            return []
+
+        tempo = song_data.tempo
+        key_name = song_data.key.split()[0]
+        key_root = self._parse_single_note(key_name + '3')
+        if 'minor' in song_data.key:
+            scale = np.array([0, 2, 3, 5, 7, 8, 10], dtype=np.int64)
+        else:
+            scale = np.array([0, 2, 4, 5, 7, 9, 11], dtype=np.int64)
+
+        # The tempo is fixed for the whole song, so the duration scaling
+        # collapses into one multiplier instead of a branchy call per event.
+        if tempo <= 60:
+            tempo_mult = 1.2
+        elif tempo >= 120:
+            tempo_mult = 0.8
+        else:
+            tempo_mult = 1.0
+
+        events = []
+        for section in sections:
+            pattern_id = random.choice(_FILL_PATTERN_IDS)
+            s_notes, s_times, s_durs, s_vels = _accompaniment_kernels.expand_section(
+                pattern_id, section.start_time, section.end_time,
+                key_root, scale, tempo_mult)
+            events.extend(zip(s_notes.tolist(), s_times.tolist(),
+                              s_durs.tolist(), s_vels.tolist()))
+
+        # Chordal layer: apply the configured pattern once per measure
+        chord_pattern = self.PATTERNS.get(style or 'basic', self.PATTERNS['basic'])
+        chord_quality = 'major' if 'major' in song_data.key else 'minor'
+        chord_notes = key_root + self._CHORD_OFFSETS[chord_quality]
+        base_time = 0.0
+        while base_time < self._song_length:
+            section = self._get_section_for_time(base_time, sections)
+            if section is None or 'intro' not in section.name.lower():
+                events.extend(self._apply_pattern(chord_pattern, chord_notes, base_time))
+            base_time += 4.0
+
+        events.sort(key=itemgetter(1))
+        return events
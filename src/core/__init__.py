@@ -0,0 +1 @@
+from src.core.song_parser import NoteData, Section, SongData, parse_song_file
@@ -0,0 +1,200 @@
+"""
+Parser for the plain text song format used by the MusicMidi generators.
+
+Song files contain metadata lines ("Title: ..."), section markers
+("[Verse 1 | gentle]") and note lines ("1.0 | C4 | mf | 0.5").
+"""
+
+import logging
+import re
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+TIME_SIG_FACTORS = {
+    '4/4': 1.0,
+    '3/4': 0.75,
+    '2/4': 0.5,
+    '6/8': 0.75,
+    '2/2': 1.0,
+    '12/8': 1.5
+}
+
+
+@dataclass(slots=True)
+class NoteData:
+    """A single playable note event."""
+    pitch: int
+    duration: float
+    start: float
+    velocity: int
+    is_rest: bool = False
+    articulation: str = 'normal'
+    original_time_sig: str = '4/4'
+
+
+@dataclass(slots=True)
+class Section:
+    """A named span of the song (verse, chorus, ...)."""
+    name: str
+    style: str = 'normal'
+    start_time: float = 0.0
+    end_time: float = 0.0
+    start_idx: int = 0
+    end_idx: int = 0
+
+
+@dataclass
+class SongData:
+    """The parsed contents of a song file."""
+    title: str = ''
+    tempo: int = 120
+    time_signature: str = '4/4'
+    key: str = 'C major'
+    genre: Optional[str] = None
+    ts_factor: float = 1.0
+    notes: List[dict] = field(default_factory=list)
+    sections: List[Section] = field(default_factory=list)
+
+
+# The optional accidental must be consumed so keys like 'Eb minor' still
+# reach the mode group; the accidental itself is dropped from the
+# normalized name, matching the original first-letter behaviour.
+_KEY_RE = re.compile(r'^\s*([a-g])\s*[#b]?\s*(m|min|minor|maj|major)?\b', re.I)
+
+
+def normalize_key(key):
+    """Normalize a key name like 'c', 'Cm' or 'C Major' to 'C major'/'C minor'."""
+    match = _KEY_RE.match(key)
+    if not match:
+        return 'C major'
+    root = match.group(1).upper()
+    mode = (match.group(2) or '').lower()
+    if mode.startswith('m') and not mode.startswith('maj'):
+        return f"{root} minor"
+    return f"{root} major"
+
+
+def _set_title(song_data, value):
+    song_data.title = value
+
+
+def _set_tempo(song_data, value):
+    try:
+        song_data.tempo = int(value)
+    except ValueError:
+        logger.warning('Invalid tempo value: %s', value)
+
+
+def _set_timesig(song_data, value):
+    if '/' in value:
+        song_data.time_signature = value
+        # Resolve the 4/4 conversion factor once here so per-note consumers
+        # can multiply instead of doing a dict lookup for every note.
+        song_data.ts_factor = TIME_SIG_FACTORS.get(value, 1.0)
+
+
+def _set_key(song_data, value):
+    song_data.key = normalize_key(value)
+
+
+def _set_genre(song_data, value):
+    song_data.genre = value.lower()
+
+
+_META_HANDLERS = {
+    'Title': _set_title,
+    'Tempo': _set_tempo,
+    'Time Signature': _set_timesig,
+    'Key': _set_key,
+    'Genre': _set_genre
+}
+
+
+def parse_song_file(file_path):
+    """Parse a song text file into a SongData object."""
+    file_path = Path(file_path)
+    song_data = SongData()
+    sections = song_data.sections
+
+    # Pre-size the notes list from the file size (roughly 32 bytes per note
+    # line) and fill through a write cursor, so large songs avoid the
+    # repeated reallocation of growing the list one append at a time.
+    approx = max(file_path.stat().st_size // 32, 16)
+    notes = [None] * approx
+    idx = 0
+
+    with open(file_path, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+
+            # Section marker, e.g. [Chorus | energetic]
+            if line.startswith('[') and line.endswith(']'):
+                value = line[1:-1].partition('#')[0].rstrip()
+                parts = value.split('|')
+                section_name = sys.intern(parts[0].strip())
+                style = sys.intern(parts[1].strip()) if len(parts) > 1 else 'normal'
+                if sections:
+                    prev = sections[-1]
+                    prev.end_idx = idx
+                    if prev.end_idx > prev.start_idx:
+                        last = notes[prev.end_idx - 1]
+                        prev.end_time = last['time'] + last['duration']
+                    else:
+                        prev.end_time = prev.start_time
+                start_time = notes[idx - 1]['time'] + notes[idx - 1]['duration'] if idx else 0.0
+                sections.append(Section(name=section_name, style=style,
+                                        start_time=start_time, start_idx=idx))
+                continue
+
+            # Metadata line, e.g. Title: My Song
+            if ':' in line and '|' not in line:
+                key_name, value = line.split(':', 1)
+                key_name = key_name.strip()
+                value = value.strip().partition('#')[0].rstrip()
+                handler = _META_HANDLERS.get(key_name)
+                if handler:
+                    handler(song_data, value)
+                continue
+
+            # Note line: time | note | dynamic | duration
+            value = line.partition('#')[0].rstrip()
+            parts = value.split('|')
+            if len(parts) < 4:
+                logger.warning('Skipping malformed note line: %s', line)
+                continue
+            time, note, dynamic, duration = parts[:4]
+            # Notes and dynamics come from a tiny alphabet ('C4', 'mf', ...);
+            # interning shares one str object per value and makes later
+            # equality checks pointer compares. Numeric fields are parsed
+            # exactly once here.
+            note_info = {
+                'time': float(time),
+                'note': sys.intern(note.strip()),
+                'dynamic': sys.intern(dynamic.strip()),
+                'duration': float(duration)
+            }
+            if idx == len(notes):
+                notes.extend([None] * len(notes))
+            notes[idx] = note_info
+            idx += 1
+
+    del notes[idx:]
+    song_data.notes = notes
+
+    # Close off the final section
+    if sections:
+        last_section = sections[-1]
+        last_section.end_idx = idx
+        if last_section.end_idx > last_section.start_idx:
+            last = notes[idx - 1]
+            last_section.end_time = last['time'] + last['duration']
+        else:
+            last_section.end_time = last_section.start_time
+
+    return song_data
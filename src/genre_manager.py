@@ -0,0 +1,355 @@
+"""
+Genre Manager for MusicMidi
+
+This module provides genre-specific music generation capabilities for the MusicMidi application.
+It defines different musical genres with their characteristic chord progressions, rhythmic patterns,
+and instrument settings.
+"""
+
+import random
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+# Rhythm patterns as frozen [beat, duration] arrays, built once and shared by
+# every genre instance. get_rhythm_pattern returns these directly; callers
+# that want to mutate a pattern must copy it first. Several genres share the
+# straight eighth-note grid.
+_ALBERTI = np.array([[i * 0.5, 0.5] for i in range(8)], dtype=np.float32)
+_EIGHTHS = _ALBERTI
+_BLOCK = np.array([[0.0, 1.0], [1.0, 1.0], [2.0, 1.0], [3.0, 1.0]], dtype=np.float32)
+_WALTZ = np.array([[0.0, 1.0], [1.0, 0.5], [1.5, 0.5],
+                   [2.0, 0.5], [2.5, 0.5], [3.0, 1.0]], dtype=np.float32)
+_SYNCOPATED = np.array([[0.0, 1.5], [1.5, 0.5], [2.0, 1.0], [3.0, 1.0]], dtype=np.float32)
+_SWING = np.array([[0.0, 0.66], [0.66, 0.34], [1.0, 0.66], [1.66, 0.34],
+                   [2.0, 0.66], [2.66, 0.34], [3.0, 0.66], [3.66, 0.34]], dtype=np.float32)
+_QUARTERS = _BLOCK
+
+class GenreBase(ABC):
+    """Abstract base class for all musical genres"""
+
+    def __init__(self, name):
+        self.name = name
+        # Default MIDI instruments (General MIDI program numbers)
+        self.instruments = {
+            'melody': 0,       # Piano
+            'accompaniment': 0  # Piano
+        }
+        # Characteristic chord progressions (as scale degrees)
+        self.chord_progressions = []
+        # Characteristic rhythm patterns as [beat, duration] pairs
+        self.rhythm_patterns = {}
+        # Typical tempo range (min, max)
+        self.tempo_range = (90, 120)
+        # Default dynamics
+        self.dynamics = {
+            'default': 'mf',
+            'variation': 'low'
+        }
+        # Characteristic articulations
+        self.articulations = {}
+        # Progressions flattened to numpy arrays, built on first use
+        self._prog_flat = None
+
+    @abstractmethod
+    def get_accompaniment_pattern(self):
+        """Return the appropriate accompaniment pattern for this genre"""
+        pass
+
+    def get_chord_progression(self, length=4):
+        """Get a characteristic chord progression for this genre"""
+        if not self.chord_progressions:
+            # Fallback to a basic I-V-vi-IV progression
+            return [0, 4, 5, 3]
+
+        if self._prog_flat is None:
+            self._prog_flat = [np.asarray(p, dtype=np.int8) for p in self.chord_progressions]
+
+        progression = self._prog_flat[random.randrange(len(self._prog_flat))]
+
+        # np.resize tiles the progression when it is shorter than requested
+        return np.resize(progression, length).tolist()
+
+    def get_tempo(self):
+        """Get a typical tempo for this genre"""
+        return random.randint(self.tempo_range[0], self.tempo_range[1])
+
+    def get_rhythm_pattern(self, pattern_type='basic'):
+        """Get a rhythm pattern characteristic of this genre.
+
+        Returns a shared read-only array; copy before mutating.
+        """
+        if pattern_type in self.rhythm_patterns:
+            return self.rhythm_patterns[pattern_type]
+
+        # Default pattern: quarter notes on each beat
+        return _QUARTERS
+
+    def get_instrument(self, part='accompaniment'):
+        """Get the MIDI instrument number for a specific part"""
+        return self.instruments.get(part, 0)
+
+class ClassicalGenre(GenreBase):
+    """Base class for classical music genres"""
+
+    def __init__(self, name='Classical'):
+        super().__init__(name)
+
+        self.chord_progressions = [
+            [0, 4, 5, 3],  # I-V-vi-IV
+            [0, 3, 4, 0],  # I-IV-V-I
+            [5, 3, 0, 4],  # vi-IV-I-V
+            [0, 4, 3, 4]   # I-V-IV-V
+        ]
+
+        self.rhythm_patterns = {
+            'alberti': _ALBERTI,
+            'block': _BLOCK,
+            'waltz': _WALTZ
+        }
+
+        self.instruments = {
+            'melody': 0,       # Piano
+            'accompaniment': 0  # Piano
+        }
+
+        self.dynamics = {
+            'default': 'mf',
+            'variation': 'high'
+        }
+
+        self.tempo_range = (70, 120)
+
+    def get_accompaniment_pattern(self):
+        """Return a typical classical accompaniment pattern"""
+        return 'alberti'
+
+class BaroqueStyle(ClassicalGenre):
+    """Baroque music style (1600-1750)"""
+
+    def __init__(self):
+        super().__init__('Baroque')
+
+        self.chord_progressions = [
+            [0, 4, 5, 3],
+            [0, 5, 3, 6, 2, 5, 0],
+            [0, 0, 4, 4, 5, 5, 0, 0]
+        ]
+
+        self.instruments = {
+            'melody': 6,       # Harpsichord
+            'accompaniment': 6  # Harpsichord
+        }
+
+        self.articulations = {
+            'trill': [0, 4, 8],
+            'mordent': [2, 6, 10]
+        }
+
+        self.tempo_range = (80, 130)
+
+    def get_accompaniment_pattern(self):
+        """Return a typical baroque accompaniment pattern"""
+        return random.choice(['alberti', 'block'])
+
+class RomanticStyle(ClassicalGenre):
+    """Romantic music style (1800-1910)"""
+
+    def __init__(self):
+        super().__init__('Romantic')
+
+        self.chord_progressions = [
+            [0, 5, 3, 4],
+            [0, 5, 1, 4],
+            [0, 2, 5, 0]
+        ]
+
+        self.instruments = {
+            'melody': 0,       # Piano
+            'accompaniment': 0  # Piano
+        }
+
+        self.tempo_range = (60, 110)
+
+    def get_accompaniment_pattern(self):
+        """Return a typical romantic accompaniment pattern"""
+        return random.choice(['alberti', 'waltz'])
+
+class PopGenre(GenreBase):
+    """Base class for popular music genres"""
+
+    def __init__(self, name='Pop'):
+        super().__init__(name)
+
+        self.chord_progressions = [
+            [0, 4, 5, 3],  # I-V-vi-IV
+            [0, 3, 4, 3],  # I-IV-V-IV
+            [0, 3, 0, 4],  # I-IV-I-V
+            [5, 3, 0, 4]   # vi-IV-I-V
+        ]
+
+        self.rhythm_patterns = {
+            'basic': _QUARTERS,
+            'eighth': _EIGHTHS,
+            'syncopated': _SYNCOPATED
+        }
+
+        self.instruments = {
+            'melody': 0,        # Piano
+            'accompaniment': 33  # Electric Bass
+        }
+
+        self.dynamics = {
+            'default': 'mf',
+            'variation': 'low'
+        }
+
+        self.tempo_range = (90, 130)
+
+    def get_accompaniment_pattern(self):
+        """Return a typical pop accompaniment pattern"""
+        return 'eighth'
+
+class RockStyle(PopGenre):
+    """Rock music style"""
+
+    def __init__(self):
+        super().__init__('Rock')
+
+        self.chord_progressions = [
+            [0, 4, 5, 3],
+            [0, 3, 0, 4],
+            [0, 0, 3, 3, 0, 0, 4, 4]
+        ]
+
+        self.instruments = {
+            'melody': 29,       # Overdriven Guitar
+            'accompaniment': 33  # Electric Bass
+        }
+
+        self.rhythm_patterns['rock'] = _EIGHTHS
+
+        self.tempo_range = (100, 140)
+
+    def get_accompaniment_pattern(self):
+        """Return a typical rock accompaniment pattern"""
+        return 'rock'
+
+class JazzGenre(GenreBase):
+    """Base class for jazz music genres"""
+
+    def __init__(self, name='Jazz'):
+        super().__init__(name)
+
+        self.chord_progressions = [
+            [1, 4, 0],        # ii-V-I
+            [0, 6, 1, 4],     # I-vii-ii-V
+            [0, 5, 1, 4, 0]   # I-vi-ii-V-I
+        ]
+
+        self.rhythm_patterns = {
+            'swing': _SWING,
+            'bossa': _EIGHTHS,
+            'walking': _EIGHTHS
+        }
+
+        self.instruments = {
+            'melody': 0,        # Piano
+            'accompaniment': 32  # Acoustic Bass
+        }
+
+        self.chord_types = {
+            'dominant7': [0, 4, 7, 10],
+            'major7': [0, 4, 7, 11],
+            'minor7': [0, 3, 7, 10],
+            'dimished7': [0, 3, 6, 9],
+            'augmented': [0, 4, 8]
+        }
+
+        self.tempo_range = (80, 140)
+
+    def get_accompaniment_pattern(self):
+        """Return a typical jazz accompaniment pattern"""
+        return 'walking'
+
+class SwingStyle(JazzGenre):
+    """Swing jazz style"""
+
+    def __init__(self):
+        super().__init__('Swing')
+
+        self.instruments = {
+            'melody': 0,        # Piano
+            'accompaniment': 32  # Acoustic Bass
+        }
+
+        self.tempo_range = (120, 220)
+
+    def get_accompaniment_pattern(self):
+        """Return a typical swing accompaniment pattern"""
+        return 'swing'
+
+class GenreManager:
+    """Manages the different genre options and provides access to them"""
+
+    def __init__(self):
+        self.genres = {}
+        self._initialize_genres()
+
+    def _initialize_genres(self):
+        """Register all available genres"""
+        # Classical genres
+        self.register_genre('classical', ClassicalGenre())
+        self.register_genre('baroque', BaroqueStyle())
+        self.register_genre('romantic', RomanticStyle())
+
+        # Pop genres
+        self.register_genre('pop', PopGenre())
+        self.register_genre('rock', RockStyle())
+
+        # Jazz genres
+        self.register_genre('jazz', JazzGenre())
+        self.register_genre('swing', SwingStyle())
+
+    def register_genre(self, genre_id, genre_instance):
+        """Register a new genre"""
+        self.genres[genre_id.lower()] = genre_instance
+
+    def get_genre(self, genre_id):
+        """Get a genre by ID"""
+        return self.genres.get(genre_id.lower(), self.genres.get('classical'))
+
+    def get_available_genres(self):
+        """Get a list of all available genres"""
+        return list(self.genres.keys())
+
+    def get_genre_info(self, genre_id):
+        """Get information about a specific genre"""
+        genre = self.get_genre(genre_id)
+        return {
+            'name': genre.name,
+            'tempo_range': genre.tempo_range,
+            'instruments': genre.instruments,
+            'chord_progressions': genre.chord_progressions
+        }
+
+    def get_genre_properties(self, genre_id):
+        """Get the property dict for a genre (defaults to classical)"""
+        genre = self.get_genre(genre_id)
+        return {
+            'tempo_range': genre.tempo_range,
+            'instruments': genre.instruments,
+            'articulations': list(genre.articulations.keys())
+        }
+
+    def get_instrument_program(self, genre_id, part='accompaniment'):
+        """Get the MIDI program number for a genre part"""
+        return self.get_genre(genre_id).instruments.get(part, 0)
+
+    def get_tempo_range(self, genre_id):
+        """Get the (min, max) tempo range for a genre"""
+        return self.get_genre(genre_id).tempo_range
+
+    def get_articulations(self, genre_id):
+        """Get the articulations available for a genre"""
+        return list(self.get_genre(genre_id).articulations.keys())
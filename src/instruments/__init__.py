@@ -0,0 +1,48 @@
+"""
+Instrument pattern generators for MusicMidi.
+"""
+
+from src.instruments.base import BaseInstrument, NoteData
+from src.instruments.bass import Bass
+from src.instruments.drums import Drums
+from src.instruments.guitar import Guitar
+from src.instruments.piano import Piano
+
+
+class InstrumentManager:
+    """Creates instrument instances by type name."""
+
+    def __init__(self):
+        self.instruments = {
+            'piano': Piano,
+            'guitar': Guitar,
+            'bass': Bass,
+            'drums': Drums
+        }
+        # Constructed instances keyed by (type, program, kwargs), so
+        # repeated requests reuse the same object and its caches instead
+        # of paying construction per call.
+        self._instance_cache = {}
+
+    def get_instrument(self, instrument_type, program=None, **kwargs):
+        """Return an instrument of the requested type, reusing instances."""
+        instrument_class = self.instruments.get(instrument_type)
+        if instrument_class is None:
+            raise ValueError(f"Unknown instrument type: {instrument_type}")
+        key = (instrument_type, program, tuple(sorted(kwargs.items())))
+        instrument = self._instance_cache.get(key)
+        if instrument is None:
+            if program is not None:
+                instrument = instrument_class(program=program, **kwargs)
+            else:
+                instrument = instrument_class(**kwargs)
+            self._instance_cache[key] = instrument
+        return instrument
+
+    def invalidate(self):
+        """Drop the pooled instances so the next requests build fresh ones."""
+        self._instance_cache.clear()
+
+    def get_available_instruments(self):
+        """List the registered instrument type names."""
+        return list(self.instruments.keys())
@@ -0,0 +1,61 @@
+"""
+Numba kernels for the bass pattern generator.
+
+The kernels only see plain numpy arrays and integer style codes; all
+string handling and dict construction stays on the Python side.
+"""
+
+import numpy as np
+from numba import njit
+
+# Style codes used by build_pattern (strings cannot cross the njit boundary)
+STYLE_ROOT = 0
+STYLE_WALKING = 1
+STYLE_GROOVE = 2
+
+
+@njit(cache=True, fastmath=True)
+def build_pattern(roots, durations, starts, tone_offsets, tone_counts,
+                  style_code, min_pitch, max_pitch, base_velocity):
+    """Emit pitch/duration/start/velocity arrays for every chord tone.
+
+    roots, durations and starts are per-chord arrays with starts already
+    absolute and converted to 4/4. tone_offsets is (n_chords, max_tones)
+    with tone_counts giving the valid prefix of each row.
+    """
+    n_chords = roots.shape[0]
+    total = 0
+    for c in range(n_chords):
+        total += tone_counts[c]
+
+    out_pitch = np.empty(total, dtype=np.int16)
+    out_dur = np.empty(total, dtype=np.float32)
+    out_start = np.empty(total, dtype=np.float32)
+    out_vel = np.empty(total, dtype=np.uint8)
+
+    # The three styles differ only in note stride; the root style packs a
+    # single zero-offset tone per chord, so one loop covers every arm.
+    if style_code == STYLE_WALKING:
+        stride = 0.2
+    elif style_code == STYLE_GROOVE:
+        stride = 0.1
+    else:
+        stride = 0.0
+
+    k = 0
+    for c in range(n_chords):
+        n = tone_counts[c]
+        dur = durations[c] / n
+        for i in range(n):
+            pitch = roots[c] + tone_offsets[c, i] - 12
+            while pitch < min_pitch:
+                pitch += 12
+            while pitch > max_pitch:
+                pitch -= 12
+            out_pitch[k] = pitch
+            out_dur[k] = dur
+            out_start[k] = starts[c] + i * stride
+            out_vel[k] = base_velocity
+            k += 1
+
+    return out_pitch, out_dur, out_start, out_vel
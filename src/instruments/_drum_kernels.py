@@ -0,0 +1,58 @@
+"""
+Numba kernels for the drum pattern generator.
+
+Like the bass kernels, these only see plain numpy arrays and scalars;
+the genre tables, variation selection and dict emission stay in Python.
+"""
+
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True)
+def emit_pattern(kick_pos, snare_pos, subdivisions, n_measures, measure_len,
+                 ts_factor, kick_pitch, snare_pitch, hihat_pitch,
+                 kick_velocity, snare_velocity, hihat_velocity,
+                 kick_duration, snare_duration, hihat_duration):
+    """Expand a default-grid drum configuration over a whole song.
+
+    Walks the measures once, emitting kick/snare hits at their beat
+    positions and the hi-hat tick grid, into preallocated output arrays.
+    Returns (pitches, durations, starts, velocities).
+    """
+    n_kick = kick_pos.shape[0]
+    n_snare = snare_pos.shape[0]
+    per_measure = n_kick + n_snare + 4 * subdivisions
+    total = n_measures * per_measure
+
+    out_pitch = np.empty(total, dtype=np.int16)
+    out_dur = np.empty(total, dtype=np.float32)
+    out_start = np.empty(total, dtype=np.float64)
+    out_vel = np.empty(total, dtype=np.int16)
+
+    sub_step = 1.0 / subdivisions
+    k = 0
+    for m in range(n_measures):
+        base = m * measure_len
+        for i in range(n_kick):
+            out_pitch[k] = kick_pitch
+            out_dur[k] = kick_duration
+            out_start[k] = base + kick_pos[i] * ts_factor
+            out_vel[k] = kick_velocity
+            k += 1
+        for i in range(n_snare):
+            out_pitch[k] = snare_pitch
+            out_dur[k] = snare_duration
+            out_start[k] = base + snare_pos[i] * ts_factor
+            out_vel[k] = snare_velocity
+            k += 1
+        for b in range(4):
+            beat = base + b * ts_factor
+            for s in range(subdivisions):
+                out_pitch[k] = hihat_pitch
+                out_dur[k] = hihat_duration
+                out_start[k] = beat + s * sub_step
+                out_vel[k] = hihat_velocity
+                k += 1
+
+    return out_pitch, out_dur, out_start, out_vel
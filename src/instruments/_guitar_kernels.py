@@ -0,0 +1,249 @@
+"""
+Numba kernels for the melodic guitar generator.
+
+The section patterns live here as an integer-dispatched ladder: pattern
+ids 0-24 are family * 5 + variant, with families ordered intro, verse,
+chorus, bridge, outro. Only arrays and scalars cross the njit boundary;
+section selection, mood handling and post-processing stay in Python.
+"""
+
+import numpy as np
+from numba import njit
+
+FAMILY_INTRO = 0
+FAMILY_VERSE = 1
+FAMILY_CHORUS = 2
+FAMILY_BRIDGE = 3
+FAMILY_OUTRO = 4
+
+VARIANTS_PER_FAMILY = 5
+
+# No pattern emits more than three events per step.
+_MAX_EVENTS_PER_STEP = 3
+
+
+@njit(cache=True, fastmath=True)
+def expand_section(pattern_id, section_start, n_steps, key_root, scale):
+    """Emit the raw events for one section.
+
+    Walks the per-second steps of the section and appends each pattern's
+    events into preallocated arrays, mirroring the old per-family lambda
+    tables one branch per variant. Returns (notes, times, durs, vels)
+    trimmed to the events actually emitted.
+    """
+    L = scale.shape[0]
+    family = pattern_id // VARIANTS_PER_FAMILY
+    variant = pattern_id % VARIANTS_PER_FAMILY
+
+    cap = n_steps * _MAX_EVENTS_PER_STEP
+    notes = np.empty(cap, dtype=np.int64)
+    times = np.empty(cap, dtype=np.float64)
+    durs = np.empty(cap, dtype=np.float64)
+    vels = np.empty(cap, dtype=np.int64)
+
+    k = 0
+    for i in range(n_steps):
+        t = section_start + i
+        if family == FAMILY_INTRO:
+            if variant == 0:
+                notes[k] = key_root + scale[i % L]
+                times[k] = t
+                durs[k] = 1.0
+                vels[k] = 55
+                k += 1
+            elif variant == 1:
+                if i % 2 == 0:
+                    notes[k] = key_root
+                    times[k] = t
+                    durs[k] = 2.0
+                    vels[k] = 50
+                    k += 1
+            elif variant == 2:
+                notes[k] = key_root + 12
+                times[k] = t
+                durs[k] = 0.5
+                vels[k] = 50
+                k += 1
+                notes[k] = key_root + 7
+                times[k] = t + 0.5
+                durs[k] = 0.5
+                vels[k] = 45
+                k += 1
+            elif variant == 3:
+                notes[k] = key_root + scale[(i * 2) % L]
+                times[k] = t
+                durs[k] = 0.5
+                vels[k] = 55
+                k += 1
+            else:
+                notes[k] = key_root + scale[i % L]
+                times[k] = t
+                durs[k] = 1.0
+                vels[k] = 45 + (i % 4) * 3
+                k += 1
+        elif family == FAMILY_VERSE:
+            if variant == 0:
+                notes[k] = key_root + scale[i % L]
+                times[k] = t
+                durs[k] = 1.0
+                vels[k] = 65
+                k += 1
+            elif variant == 1:
+                notes[k] = key_root
+                times[k] = t
+                durs[k] = 0.5
+                vels[k] = 60
+                k += 1
+                notes[k] = key_root + 7
+                times[k] = t + 0.5
+                durs[k] = 0.5
+                vels[k] = 55
+                k += 1
+            elif variant == 2:
+                notes[k] = key_root + scale[(i * 3) % L]
+                times[k] = t
+                durs[k] = 0.5
+                vels[k] = 60
+                k += 1
+            elif variant == 3:
+                if i % 2 == 0:
+                    notes[k] = key_root + 12
+                    vels[k] = 60
+                else:
+                    notes[k] = key_root
+                    vels[k] = 55
+                times[k] = t
+                durs[k] = 1.0
+                k += 1
+            else:
+                notes[k] = key_root + scale[i % L]
+                times[k] = t
+                durs[k] = 0.75
+                vels[k] = 60
+                k += 1
+                notes[k] = key_root
+                times[k] = t + 0.75
+                durs[k] = 0.25
+                vels[k] = 50
+                k += 1
+        elif family == FAMILY_CHORUS:
+            if variant == 0:
+                notes[k] = key_root + scale[i % L]
+                times[k] = t
+                durs[k] = 0.5
+                vels[k] = 80
+                k += 1
+                notes[k] = key_root + 12
+                times[k] = t + 0.5
+                durs[k] = 0.5
+                vels[k] = 75
+                k += 1
+            elif variant == 1:
+                notes[k] = key_root + 12
+                times[k] = t
+                durs[k] = 1.0
+                vels[k] = 85
+                k += 1
+            elif variant == 2:
+                notes[k] = key_root + scale[(i * 2) % L]
+                times[k] = t
+                durs[k] = 0.5
+                vels[k] = 80
+                k += 1
+            elif variant == 3:
+                notes[k] = key_root
+                times[k] = t
+                durs[k] = 0.5
+                vels[k] = 80
+                k += 1
+                notes[k] = key_root + 7
+                times[k] = t + 0.25
+                durs[k] = 0.5
+                vels[k] = 75
+                k += 1
+                notes[k] = key_root + 12
+                times[k] = t + 0.5
+                durs[k] = 0.5
+                vels[k] = 80
+                k += 1
+            else:
+                notes[k] = key_root + scale[i % L] + 12
+                times[k] = t
+                durs[k] = 1.0
+                vels[k] = 78
+                k += 1
+        elif family == FAMILY_BRIDGE:
+            if variant == 0:
+                notes[k] = key_root + scale[(i + 3) % L]
+                times[k] = t
+                durs[k] = 1.0
+                vels[k] = 70
+                k += 1
+            elif variant == 1:
+                if i % 2 == 0:
+                    notes[k] = key_root + 5
+                else:
+                    notes[k] = key_root + 7
+                times[k] = t
+                durs[k] = 1.0
+                vels[k] = 68
+                k += 1
+            elif variant == 2:
+                notes[k] = key_root + scale[(L - 1 - i) % L]
+                times[k] = t
+                durs[k] = 0.5
+                vels[k] = 70
+                k += 1
+            elif variant == 3:
+                if i % 2 == 0:
+                    notes[k] = key_root + scale[i % L]
+                    times[k] = t
+                    durs[k] = 1.5
+                    vels[k] = 65
+                    k += 1
+            else:
+                notes[k] = key_root + 7
+                times[k] = t
+                durs[k] = 0.5
+                vels[k] = 70
+                k += 1
+                notes[k] = key_root + 5
+                times[k] = t + 0.5
+                durs[k] = 0.5
+                vels[k] = 65
+                k += 1
+        else:
+            if variant == 0:
+                notes[k] = key_root + scale[i % L]
+                times[k] = t
+                durs[k] = 1.0
+                vels[k] = max(30, 60 - i * 2)
+                k += 1
+            elif variant == 1:
+                if i % 2 == 0:
+                    notes[k] = key_root
+                    times[k] = t
+                    durs[k] = 2.0
+                    vels[k] = max(30, 55 - i * 3)
+                    k += 1
+            elif variant == 2:
+                notes[k] = key_root + 12
+                times[k] = t
+                durs[k] = 1.0
+                vels[k] = max(30, 58 - i * 2)
+                k += 1
+            elif variant == 3:
+                notes[k] = key_root + scale[(i * 2) % L]
+                times[k] = t
+                durs[k] = 1.0
+                vels[k] = max(25, 50 - i * 2)
+                k += 1
+            else:
+                if i == 0:
+                    notes[k] = key_root
+                    times[k] = t
+                    durs[k] = 4.0
+                    vels[k] = 40
+                    k += 1
+
+    return notes[:k], times[:k], durs[:k], vels[:k]
@@ -0,0 +1,67 @@
+"""
+Numba kernels for the piano pattern generator.
+
+Chord expansion — per-voice starts, split durations and range folding —
+is pure scalar arithmetic, so it compiles cleanly. The whole song's
+chords arrive flattened CSR-style (one values array plus offsets), and
+each chord writes a disjoint output slice, so the expansion parallelizes
+without locks. Only arrays and scalars cross the njit boundary;
+variation choice, velocity handling and dict emission stay in Python.
+"""
+
+import numpy as np
+from numba import njit, prange
+
+
+# The explicit signature compiles the kernel at import time rather than
+# on the first chord of the first song, so short-lived worker processes
+# do not pay the JIT lag mid-generation; cache=True persists the build.
+@njit('Tuple((i8[:], f8[:], f8[:]))'
+      '(i8[:], i8[:], i8[:], f8[:], f8[:], f8[:], i8[:], f8, b1, i8, i8)',
+      cache=True, parallel=True)
+def expand_chords(voicings, voicing_offsets, out_offsets, base_starts,
+                  voice_durations, lead_durations, root_pitches,
+                  stride, leading_root, min_pitch, max_pitch):
+    """Expand every chord of a song into (pitches, durations, starts).
+
+    Chord c's voicing is voicings[voicing_offsets[c]:voicing_offsets[c+1]]
+    and its output lands in the slice starting at out_offsets[c], so the
+    chords expand independently in parallel. Every style reduces to the
+    same walk: each voice lasts voice_durations[c] and is staggered by
+    stride (zero for block chords); when leading_root is set an extra
+    root note at the full converted duration is emitted first, matching
+    the broken style. All pitches are folded into [min_pitch, max_pitch]
+    by whole octaves.
+    """
+    n_chords = voicing_offsets.shape[0] - 1
+    total = out_offsets[n_chords]
+    pitches = np.empty(total, dtype=np.int64)
+    durations = np.empty(total, dtype=np.float64)
+    starts = np.empty(total, dtype=np.float64)
+
+    for c in prange(n_chords):
+        k = out_offsets[c]
+        base = base_starts[c]
+        if leading_root:
+            pitches[k] = root_pitches[c]
+            durations[k] = lead_durations[c]
+            starts[k] = base
+            k += 1
+        v0 = voicing_offsets[c]
+        n_voices = voicing_offsets[c + 1] - v0
+        voice_duration = voice_durations[c]
+        for i in range(n_voices):
+            pitches[k] = voicings[v0 + i]
+            durations[k] = voice_duration
+            starts[k] = base + i * stride
+            k += 1
+
+    for j in prange(total):
+        p = pitches[j]
+        if p < min_pitch:
+            p += 12 * ((min_pitch - p + 11) // 12)
+        elif p > max_pitch:
+            p -= 12 * ((p - max_pitch + 11) // 12)
+        pitches[j] = p
+
+    return pitches, durations, starts
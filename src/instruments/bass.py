@@ -0,0 +1,165 @@
+"""
+Bass instrument pattern generation.
+"""
+
+import logging
+from functools import lru_cache
+from types import MappingProxyType
+
+import numpy as np
+
+from src.instruments import _bass_kernels
+from src.instruments.base import BaseInstrument
+
+logger = logging.getLogger(__name__)
+
+_STYLE_TO_CODE = {
+    'root': _bass_kernels.STYLE_ROOT,
+    'walking': _bass_kernels.STYLE_WALKING,
+    'groove': _bass_kernels.STYLE_GROOVE
+}
+
+
+@lru_cache(maxsize=1024)
+def _get_chord_notes_cached(root, chord_type):
+    """Memoized bass voicing; chord progressions repeat the same few
+    (root, type) pairs throughout a song, so hits dominate."""
+    if chord_type == 'minor':
+        return (root, root + 3, root + 7, root + 12)
+    return (root, root + 4, root + 7, root + 12)
+
+
+class Bass(BaseInstrument):
+    """Bass instrument with song-level pattern generation and variations."""
+
+    # Song-level variations shared by every instance; treat as read-only.
+    _VARIATIONS = (
+        {'style': 'root', 'velocity': 80},
+        {'style': 'walking', 'velocity': 85},
+        {'style': 'groove', 'velocity': 90}
+    )
+
+    # Immutable tables shared by every instance instead of per-object dicts.
+    _RANGE_BY_STYLE = MappingProxyType({
+        'walking': (28, 55),
+        'rock': (28, 52),
+        'funk': (28, 55),
+        'jazz': (28, 57),
+        'pop': (28, 52)
+    })
+    _CHORD_PROGRESSIONS = MappingProxyType({
+        'major': (0, 5, 7, 0),
+        'minor': (0, 3, 7, 0),
+        'blues': (0, 0, 5, 0, 7, 5, 0, 7)
+    })
+
+    def __init__(self, program=33, seed=None):
+        super().__init__(program=program)
+        # PCG64 is faster than the stdlib Mersenne Twister and an explicit
+        # seed makes batch runs reproducible.
+        self._rng = np.random.default_rng(seed)
+        # Constants derived from the selected variation, filled in lazily by
+        # generate_pattern the first time it sees a new config.
+        self._specialized_config = None
+        self._style_code = _bass_kernels.STYLE_ROOT
+        self._base_velocity = 80
+
+    def get_playable_range(self):
+        return (28, 55)
+
+    def get_chord_notes(self, root, chord_type):
+        """Bass voicing: root, third colour, fifth and octave."""
+        return _get_chord_notes_cached(root, chord_type)
+
+    def generate_pattern(self, song_data, style=None, genre=None, is_new_song=False):
+        """Generate a bass line for the whole song."""
+        logger.info("Generating bass pattern for genre: %s", genre or 'rock')
+
+        original_time_sig = song_data.get('time_signature', '4/4')
+        measures = song_data.get('measures', [])
+
+        if is_new_song or self.current_song_variation is None:
+            self.current_song_variation = (
+                self._VARIATIONS[self._rng.integers(0, len(self._VARIATIONS))])
+            logger.info("Selected bass variation: %s", self.current_song_variation['style'])
+        pattern_config = self.current_song_variation
+
+        # Specialize once per selected variation: the style code and the
+        # clamped velocity are fixed until the variation changes, so derive
+        # them here instead of on every call.
+        if pattern_config is not self._specialized_config:
+            self._specialized_config = pattern_config
+            self._style_code = _STYLE_TO_CODE.get(pattern_config['style'],
+                                                  _bass_kernels.STYLE_ROOT)
+            self._base_velocity = self.normalize_velocity(pattern_config['velocity'])
+
+        n_chords = sum(len(measure.get('chords', [])) for measure in measures)
+        if n_chords == 0:
+            return []
+
+        style_code = self._style_code
+
+        # Pack the chords into contiguous arrays in a single pre-pass; the
+        # kernel only sees numbers, so starts are made absolute here.
+        roots = np.empty(n_chords, dtype=np.int16)
+        durations = np.empty(n_chords, dtype=np.float32)
+        starts = np.empty(n_chords, dtype=np.float32)
+        tone_offsets = np.zeros((n_chords, 4), dtype=np.int16)
+        tone_counts = np.ones(n_chords, dtype=np.int16)
+
+        # The time signature is fixed for the whole song, so resolve the 4/4
+        # conversion factor once instead of calling convert_to_4_4 per chord.
+        ts_factor = self.time_signature_factors.get(original_time_sig, 1.0)
+        measure_time_step = 4.0 * ts_factor
+
+        c = 0
+        current_time = 0.0
+        # One-slot cache: held chords and ostinatos repeat the same
+        # (root, type) back to back, skipping even the lru_cache lookup.
+        last_key = None
+        last_notes = None
+        for measure in measures:
+            for chord in measure.get('chords', []):
+                root = chord['root']
+                roots[c] = root
+                durations[c] = chord['duration'] * ts_factor
+                starts[c] = current_time + chord['start'] * ts_factor
+                if style_code != _bass_kernels.STYLE_ROOT:
+                    key = (root, chord['type'])
+                    if key == last_key:
+                        chord_notes = last_notes
+                    else:
+                        chord_notes = self.get_chord_notes(root, key[1])
+                        last_key = key
+                        last_notes = chord_notes
+                    tone_counts[c] = len(chord_notes)
+                    for i, pitch in enumerate(chord_notes):
+                        tone_offsets[c, i] = pitch - root
+                c += 1
+
+            melody = measure.get('melody', [])
+            if melody and logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Bass following %d melody notes in measure", len(melody))
+
+            current_time += measure_time_step
+
+        min_pitch, max_pitch = self.get_playable_range()
+        pitches, note_durations, note_starts, velocities = _bass_kernels.build_pattern(
+            roots, durations, starts, tone_offsets, tone_counts,
+            style_code, min_pitch, max_pitch, self._base_velocity)
+
+        # tolist() converts each array to native Python scalars in C; the
+        # comprehension then builds all the boundary dicts in one pass
+        # instead of indexing the arrays element by element.
+        return [
+            {
+                'pitch': p,
+                'duration': d,
+                'start': s,
+                'velocity': v,
+                'is_rest': False,
+                'original_time_sig': original_time_sig
+            }
+            for p, d, s, v in zip(pitches.tolist(), note_durations.tolist(),
+                                  note_starts.tolist(), velocities.tolist())
+        ]
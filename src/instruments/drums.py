@@ -0,0 +1,241 @@
+"""
+Drum kit pattern generation.
+"""
+
+import logging
+import random
+from types import MappingProxyType
+
+import numpy as np
+
+from src.instruments import _drum_kernels
+from src.instruments.base import BaseInstrument, NoteEvent
+
+logger = logging.getLogger(__name__)
+
+# Genre pattern configurations, built once at import time and shared by all
+# Drums instances. Treat every nested structure as read-only.
+_GENRE_PATTERNS = MappingProxyType({
+    'rock': {
+        'base': {
+            'kick': (0, 2), 'snare': (1, 3), 'hihat': 'eighth',
+            'velocity': {'kick': 100, 'snare': 90, 'hihat': 70}
+        },
+        'variations': [
+            {'kick': (0, 2, 3), 'snare': (1, 3), 'hihat': 'eighth',
+             'velocity': {'kick': 105, 'snare': 95, 'hihat': 70}},
+            {'kick': (0, 2), 'snare': (1, 3), 'hihat': 'sixteenth',
+             'velocity': {'kick': 100, 'snare': 90, 'hihat': 65}}
+        ]
+    },
+    'pop': {
+        'base': {
+            'kick': (0, 2), 'snare': (1, 3), 'hihat': 'eighth',
+            'velocity': {'kick': 95, 'snare': 85, 'hihat': 65}
+        },
+        'variations': [
+            {'kick': (0, 1, 2), 'snare': (1, 3), 'hihat': 'eighth',
+             'velocity': {'kick': 95, 'snare': 85, 'hihat': 60}}
+        ]
+    },
+    'jazz': {
+        'base': {
+            'kick': (0, 1, 2, 3), 'snare': (1, 3), 'hihat': 'quarter',
+            'velocity': {'kick': 70, 'snare': 65, 'hihat': 60}
+        },
+        'variations': [
+            {'kick': (0, 2), 'snare': (1, 3), 'hihat': 'quarter',
+             'velocity': {'kick': 65, 'snare': 60, 'hihat': 55}}
+        ]
+    },
+    'funk': {
+        'base': {
+            'kick': (0, 1, 2, 3), 'snare': (1, 3), 'hihat': 'sixteenth',
+            'velocity': {'kick': 100, 'snare': 95, 'hihat': 70}
+        },
+        'variations': [
+            {'kick': (0, 2, 3), 'snare': (1, 3), 'hihat': 'sixteenth',
+             'velocity': {'kick': 105, 'snare': 95, 'hihat': 75}}
+        ]
+    }
+})
+
+# Hi-hat subdivision counts per named rate.
+_SUBDIVISIONS = {'eighth': 2, 'sixteenth': 4, 'quarter': 1}
+
+# Flat per-genre candidate tuples so variation selection is one dict hit and
+# one random.choice with no list rebuilt per call.
+_VARIATION_POOL = {
+    genre: (config['base'], *config['variations'])
+    for genre, config in _GENRE_PATTERNS.items()
+}
+
+
+class Drums(BaseInstrument):
+    """Drum kit with genre-aware song-level pattern generation."""
+
+    # Shared, immutable General MIDI percussion map; one instance-wide dict
+    # per Drums object was pure allocation overhead.
+    _DRUM_MAP = MappingProxyType({
+        'kick': 36,
+        'snare': 38,
+        'hihat': 42,
+        'hihat_open': 46,
+        'crash': 49,
+        'ride': 51
+    })
+
+    def __init__(self, program=0, seed=None):
+        super().__init__(program=program)
+        self.genre_patterns = _GENRE_PATTERNS
+        # Instance-local RNG: skips the module-global Mersenne Twister's
+        # lock and lookup, and an explicit seed makes batch runs
+        # reproducible, matching Bass.
+        self._rng = random.Random(seed)
+
+    def get_playable_range(self):
+        return (35, 81)
+
+    def generate_pattern_arrays(self, song_data, style=None, genre=None,
+                                is_new_song=False, variation_seed=None):
+        """Generate the song's drum pattern as a struct-of-arrays.
+
+        Returns (pitches, durations, starts, velocities) numpy arrays; this
+        is the fast path, with generate_pattern as the dict-emitting wrapper
+        around it. When variation_seed is given the variation is derived
+        from it without touching instance state, so one Drums can be shared
+        across songs and workers.
+        """
+        original_time_sig = song_data.get('time_signature', '4/4')
+        measures = song_data.get('measures', [])
+
+        pool = _VARIATION_POOL.get(genre, _VARIATION_POOL['rock'])
+        if variation_seed is not None:
+            pattern_config = pool[variation_seed % len(pool)]
+        else:
+            if is_new_song or self.current_song_variation is None:
+                self.current_song_variation = self._rng.choice(pool)
+            pattern_config = self.current_song_variation
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Using pattern configuration: %s", pattern_config)
+
+        ts_factor = self.time_signature_factors.get(original_time_sig, 1.0)
+        measure_time_step = 4.0 * ts_factor
+
+        # Each channel is constant in everything but start time, and the
+        # adjustments never touch the start, so resolve the adjusted fields
+        # once per channel without building throwaway NoteData objects.
+        velocities = pattern_config['velocity']
+        kick_pitch, kick_velocity, kick_duration = self._adjust_fields(
+            self._DRUM_MAP['kick'], velocities['kick'], 0.1, style, genre)
+        snare_pitch, snare_velocity, snare_duration = self._adjust_fields(
+            self._DRUM_MAP['snare'], velocities['snare'], 0.1, style, genre)
+        hihat_pitch, hihat_velocity, hihat_duration = self._adjust_fields(
+            self._DRUM_MAP['hihat'], velocities['hihat'], 0.05, style, genre)
+
+        subdivisions = _SUBDIVISIONS.get(pattern_config['hihat'], 1)
+        # Subdivision offsets within one beat, shared by every measure.
+        offsets = np.arange(subdivisions, dtype=np.float64) / subdivisions
+
+        # Convert the kick/snare position tuples to arrays once per song so
+        # np.isin is not handed a fresh Python sequence every measure.
+        kick_positions = np.asarray(pattern_config['kick'], dtype=np.int16)
+        snare_positions = np.asarray(pattern_config['snare'], dtype=np.int16)
+
+        if not any('beats' in measure and measure['beats'] for measure in measures):
+            # Fast path: every measure uses the default four-beat grid, so
+            # the whole song is one compiled sweep over preallocated arrays
+            # with no Python per-measure loop at all.
+            return _drum_kernels.emit_pattern(
+                kick_positions, snare_positions, subdivisions,
+                len(measures), measure_time_step, ts_factor,
+                kick_pitch, snare_pitch, hihat_pitch,
+                kick_velocity, snare_velocity, hihat_velocity,
+                kick_duration, snare_duration, hihat_duration)
+        else:
+            kick_parts = []
+            snare_parts = []
+            hihat_parts = []
+            current_time = 0.0
+            for measure in measures:
+                beats = measure.get('beats', [])
+                if not beats:
+                    beats = [{'position': p, 'start': float(p)} for p in range(4)]
+
+                # One pass over the beat dicts fills both preallocated
+                # arrays; everything downstream works on the arrays alone.
+                n = len(beats)
+                positions = np.empty(n, dtype=np.int16)
+                starts = np.empty(n, dtype=np.float32)
+                for i, b in enumerate(beats):
+                    positions[i] = b['position']
+                    starts[i] = b['start']
+                converted = current_time + starts * ts_factor
+
+                kick_parts.append(converted[np.isin(positions, kick_positions)])
+                snare_parts.append(converted[np.isin(positions, snare_positions)])
+                # Broadcast beat starts against the subdivision offsets; the
+                # whole measure's hi-hat grid comes out of one ravel.
+                hihat_parts.append((converted[:, None] + offsets).ravel())
+
+                current_time += measure_time_step
+
+            kick_starts = np.concatenate(kick_parts) if kick_parts else np.empty(0)
+            snare_starts = np.concatenate(snare_parts) if snare_parts else np.empty(0)
+            hihat_starts = np.concatenate(hihat_parts) if hihat_parts else np.empty(0)
+
+        n_kick, n_snare, n_hihat = len(kick_starts), len(snare_starts), len(hihat_starts)
+        pitches = np.concatenate([
+            np.full(n_kick, kick_pitch, dtype=np.int16),
+            np.full(n_snare, snare_pitch, dtype=np.int16),
+            np.full(n_hihat, hihat_pitch, dtype=np.int16)
+        ])
+        durations = np.concatenate([
+            np.full(n_kick, kick_duration, dtype=np.float32),
+            np.full(n_snare, snare_duration, dtype=np.float32),
+            np.full(n_hihat, hihat_duration, dtype=np.float32)
+        ])
+        note_starts = np.concatenate([kick_starts, snare_starts, hihat_starts])
+        note_velocities = np.concatenate([
+            np.full(n_kick, kick_velocity, dtype=np.int16),
+            np.full(n_snare, snare_velocity, dtype=np.int16),
+            np.full(n_hihat, hihat_velocity, dtype=np.int16)
+        ])
+        return pitches, durations, note_starts, note_velocities
+
+    def generate_pattern_columns(self, song_data, style=None, genre=None,
+                                 is_new_song=False, variation_seed=None):
+        """Generate the pattern as named columns for serialization.
+
+        A dict of numpy arrays serializes through
+        orjson.dumps(cols, option=orjson.OPT_SERIALIZE_NUMPY) in one pass,
+        without re-encoding the six field names for every note the way a
+        list of per-note dicts does.
+        """
+        pitches, durations, starts, velocities = self.generate_pattern_arrays(
+            song_data, style, genre, is_new_song, variation_seed)
+        return {
+            'pitch': pitches,
+            'duration': durations,
+            'start': starts,
+            'velocity': velocities,
+            'original_time_sig': song_data.get('time_signature', '4/4')
+        }
+
+    def generate_pattern(self, song_data, style=None, genre=None, is_new_song=False,
+                         variation_seed=None):
+        """Generate a drum pattern for the whole song as a list of NoteEvents."""
+        if not song_data.get('measures'):
+            return []
+        original_time_sig = song_data.get('time_signature', '4/4')
+        pitches, durations, starts, velocities = self.generate_pattern_arrays(
+            song_data, style, genre, is_new_song, variation_seed)
+
+        # Every variation emits at least the hi-hat grid for each measure,
+        # so a non-empty song always produces notes and no fallback pattern
+        # is needed.
+        return [
+            NoteEvent(p, d, s, v, False, original_time_sig)
+            for p, d, s, v in zip(pitches.tolist(), durations.tolist(),
+                                  starts.tolist(), velocities.tolist())
+        ]
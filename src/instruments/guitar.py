@@ -0,0 +1,283 @@
+"""
+Guitar pattern generation.
+"""
+
+import bisect
+import logging
+import random
+import re
+from functools import lru_cache
+from operator import attrgetter
+
+import numpy as np
+
+from src.instruments import _guitar_kernels
+from src.instruments.base import BaseInstrument
+
+logger = logging.getLogger(__name__)
+
+
+# Semitone offsets of the natural note names, shared by every parse call
+# instead of a dict literal rebuilt per note.
+_BASE = {'C': 0, 'D': 2, 'E': 4, 'F': 5, 'G': 7, 'A': 9, 'B': 11}
+
+# Memoized note-token → MIDI results; songs reuse a small vocabulary of
+# note strings, so parsing collapses into a single dict hit.
+_NOTE_CACHE = {}
+
+# Chromatic name → semitone index; a hashed lookup instead of rebuilding a
+# twelve-element list and scanning it with list.index per call.
+_NOTE_INDEX = {n: i for i, n in enumerate(
+    ('C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B'))}
+
+# Velocity boost applied per section mood.
+_MOOD_BOOST = {'energetic': 10, 'happy': 5, 'calm': -10, 'sad': -15}
+
+# Pulls the note tokens out of a chord like '[E3,G3,B3]' in one linear
+# pass, without the intermediate list and stripped strings of split(',').
+_CHORD_RE = re.compile(r'\s*([A-Ga-g]s?\d)\s*[,\]]')
+
+# One alternation finds any mood keyword in a single pass over the style
+# comment instead of up to eight substring scans.
+_MOOD_RE = re.compile(
+    r'energetic|upbeat|calm|peaceful|sad|melancholic|happy|joyful', re.I)
+_MOOD_MAP = {
+    'energetic': 'energetic', 'upbeat': 'energetic',
+    'calm': 'calm', 'peaceful': 'calm',
+    'sad': 'sad', 'melancholic': 'sad',
+    'happy': 'happy', 'joyful': 'happy'
+}
+
+
+@lru_cache(maxsize=128)
+def _mood_for(comments):
+    """Memoized mood classification of a style-comment string.
+
+    Sections are slotted dataclasses, so the cache keys on the comment
+    text itself; songs reuse the same few style strings across sections.
+    """
+    match = _MOOD_RE.search(comments)
+    return _MOOD_MAP[match.group(0).lower()] if match else 'neutral'
+
+# Variant indices within each pattern family, shared by every selection.
+_VARIANT_IDS = tuple(range(_guitar_kernels.VARIANTS_PER_FAMILY))
+
+# Section-name keyword → pattern family, scanned in order; unknown
+# section names fall back to the verse family.
+_SECTION_TABLE = (
+    ('intro', _guitar_kernels.FAMILY_INTRO),
+    ('verse', _guitar_kernels.FAMILY_VERSE),
+    ('chorus', _guitar_kernels.FAMILY_CHORUS),
+    ('bridge', _guitar_kernels.FAMILY_BRIDGE),
+    ('outro', _guitar_kernels.FAMILY_OUTRO)
+)
+
+
+class Guitar(BaseInstrument):
+    """Guitar generating section-aware melodic patterns for a parsed song."""
+
+    # Constant range shared by every instance; reading the attribute skips
+    # a method call in the pattern generator.
+    PLAYABLE_RANGE = (40, 88)
+
+    def __init__(self, program=24, seed=None):
+        super().__init__(program=program)
+        # Instance-local RNG seeded once instead of reseeding the global
+        # PRNG from the wall clock on every call; an explicit seed makes
+        # batch runs reproducible, matching Bass and Drums.
+        self._rng = random.Random(seed)
+        # One-slot index for _get_section_for_time, rebuilt only when a
+        # different sections list comes in.
+        self._section_index = None
+        # Generated patterns keyed by song fingerprint; re-rendering the
+        # same song skips the whole section expansion.
+        self._pattern_memo = {}
+
+    def get_playable_range(self):
+        return self.PLAYABLE_RANGE
+
+    def _parse_single_note(self, note_str):
+        """Parse a note token like 'C4' or 'Fs3' (sharp written as 's')."""
+        midi = _NOTE_CACHE.get(note_str)
+        if midi is None:
+            sharp = 's' in note_str
+            octave = int(note_str[-1])
+            midi = _BASE[note_str[0].upper()] + (1 if sharp else 0) + (octave + 1) * 12
+            _NOTE_CACHE[note_str] = midi
+        return midi
+
+    def _note_to_midi(self, note):
+        """Convert a note name with '#' accidentals like 'C#4' to a MIDI number."""
+        return 12 * (int(note[-1]) + 1) + _NOTE_INDEX[note[:-1]]
+
+    def _parse_note(self, note_str):
+        """Parse a single note or a chord like '[E3,G3,B3]' into MIDI numbers."""
+        if note_str.startswith('['):
+            return [self._parse_single_note(m.group(1))
+                    for m in _CHORD_RE.finditer(note_str[1:])]
+        return [self._parse_single_note(note_str)]
+
+    def _get_section_mood(self, section):
+        """Infer a rough mood from the section's style comments."""
+        return _mood_for(section.style or '')
+
+    def _get_section_for_time(self, time, sections):
+        """Find the section containing the given time, if any.
+
+        Binary search over start times instead of a linear scan; the
+        sorted index is cached per sections list.
+        """
+        index = self._section_index
+        if index is None or index[0] is not sections:
+            ordered = sorted(sections, key=attrgetter('start_time'))
+            starts = [s.start_time for s in ordered]
+            index = self._section_index = (sections, starts, ordered)
+        i = bisect.bisect_right(index[1], time) - 1
+        # Adjacent sections share their boundary times, so scan left
+        # through the containing run to resolve a boundary query to the
+        # same section the old first-match linear scan returned.
+        ordered = index[2]
+        found = None
+        while i >= 0 and ordered[i].end_time >= time:
+            found = ordered[i]
+            i -= 1
+        return found
+
+    def generate_pattern(self, song_data, style=None, genre=None, is_new_song=False):
+        """Generate guitar events for every section of the song."""
+        # Fingerprint the inputs that shape the output; the RNG is only
+        # consulted on a miss, so repeat renders return the cached events.
+        memo_key = (
+            song_data.key, song_data.tempo, style, genre,
+            tuple((s.name, s.start_time, s.end_time, s.style)
+                  for s in song_data.sections),
+            (song_data.notes[-1]['time'], song_data.notes[-1]['duration'])
+            if song_data.notes else None
+        )
+        cached = self._pattern_memo.get(memo_key)
+        if cached is not None:
+            # Shallow copy so callers can reorder or trim their list
+            # without corrupting the cache.
+            return list(cached)
+
+        logger.info("Generating guitar pattern in %s style", style or 'melodic')
+
+        min_note, max_note = self.PLAYABLE_RANGE
+
+        key_name = song_data.key.split()[0]
+        key_root = self._note_to_midi(key_name + '3')
+        if 'minor' in song_data.key:
+            scale = np.array([0, 2, 3, 5, 7, 8, 10], dtype=np.int64)
+        else:
+            scale = np.array([0, 2, 4, 5, 7, 9, 11], dtype=np.int64)
+
+        tempo = song_data.tempo
+
+        def validate_note(note):
+            # Closed-form octave folding: compute the whole shift at once
+            # instead of stepping one octave per loop iteration, matching
+            # the vectorized fold used on the packed arrays below.
+            if note < min_note:
+                note += 12 * ((min_note - note + 11) // 12)
+            if note > max_note:
+                note -= 12 * ((note - max_note + 11) // 12)
+            return note
+
+        # The tempo is fixed for the whole song, so the duration scaling
+        # collapses into one multiplier applied to the packed array below.
+        if tempo <= 60:
+            tempo_mult = 1.2
+        elif tempo >= 120:
+            tempo_mult = 0.8
+        else:
+            tempo_mult = 1.0
+
+        total_song_length = 0.0
+        if song_data.sections:
+            total_song_length = max(s.end_time for s in song_data.sections)
+        if not total_song_length and song_data.notes:
+            total_song_length = float(song_data.notes[-1]['time']) + float(song_data.notes[-1]['duration'])
+
+        # Struct-of-arrays accumulation: the kernel emits raw numbers per
+        # section, and all the per-event work — range folding, tempo
+        # scaling, truncation, clamping, sorting — happens vectorized
+        # afterwards. One fixed-size slot per section, filled by index.
+        n_sections = len(song_data.sections)
+        note_parts = [None] * n_sections
+        time_parts = [None] * n_sections
+        dur_parts = [None] * n_sections
+        vel_parts = [None] * n_sections
+        end_parts = [None] * n_sections
+        for s_idx, section in enumerate(song_data.sections):
+            section_type = section.name.lower()
+            family = next((f for keyword, f in _SECTION_TABLE
+                           if keyword in section_type),
+                          _guitar_kernels.FAMILY_VERSE)
+
+            mood = self._get_section_mood(section)
+            mood_boost = _MOOD_BOOST.get(mood, 0)
+
+            variant = self._rng.choice(_VARIANT_IDS)
+            pattern_id = family * _guitar_kernels.VARIANTS_PER_FAMILY + variant
+
+            section_start = section.start_time
+            section_end = section.end_time
+            n_steps = int(section_end - section_start)
+
+            s_notes, s_times, s_durs, s_vels = _guitar_kernels.expand_section(
+                pattern_id, section_start, n_steps, key_root, scale)
+            note_parts[s_idx] = s_notes
+            time_parts[s_idx] = s_times
+            dur_parts[s_idx] = s_durs
+            vel_parts[s_idx] = s_vels + mood_boost if mood_boost else s_vels
+            end_parts[s_idx] = np.full(len(s_notes), section_end)
+
+        if note_parts:
+            notes = np.concatenate(note_parts)
+            times = np.concatenate(time_parts)
+            durs = np.concatenate(dur_parts) * tempo_mult
+            ends = np.concatenate(end_parts)
+
+            # Closed-form octave folding: first lift everything below the
+            # range up by whole octaves, then drop anything above, matching
+            # the two while-loops of validate_note.
+            low = notes < min_note
+            notes[low] -= 12 * ((notes[low] - min_note) // 12)
+            high = notes > max_note
+            notes[high] += 12 * ((max_note - notes[high]) // 12)
+
+            # Truncate at the section boundary and the end of the song, and
+            # clamp velocities, in one vectorized pass each.
+            durs = np.minimum(durs, ends - times)
+            durs = np.minimum(durs, total_song_length - times)
+            vels = np.clip(np.concatenate(vel_parts), 1, 127)
+
+            keep = (durs > 0) & (times < total_song_length)
+            order = np.argsort(times[keep], kind='stable')
+            events = list(zip(notes[keep][order].tolist(),
+                              times[keep][order].tolist(),
+                              durs[keep][order].tolist(),
+                              vels[keep][order].tolist()))
+        else:
+            events = []
+
+        # Fill any silent gap at the end of the song with sustained root
+        # notes: the count of full 2.0-beat fills falls out of one division,
+        # so the whole tail is built in a single comprehension.
+        if events:
+            last = events[-1]
+            gap_start = last[1] + last[2]
+        else:
+            gap_start = 0.0
+        remaining = total_song_length - gap_start
+        if remaining > 0:
+            root = validate_note(key_root)
+            n_full = int(remaining // 2.0)
+            fills = [(root, gap_start + k * 2.0, 2.0, 45) for k in range(n_full)]
+            tail = remaining - n_full * 2.0
+            if tail > 0:
+                fills.append((root, gap_start + n_full * 2.0, tail, 45))
+            events.extend(fills)
+
+        self._pattern_memo[memo_key] = events
+        return list(events)
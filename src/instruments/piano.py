@@ -0,0 +1,236 @@
+"""
+Piano pattern generation.
+"""
+
+import logging
+import random
+from collections import namedtuple
+
+import numpy as np
+
+from src.instruments import _piano_kernels
+from src.instruments.base import BaseInstrument
+
+logger = logging.getLogger(__name__)
+
+# Boundary dict field order, shared by the single bulk emission at the end
+# of generate_pattern; matches base.NoteEvent's fields.
+_KEYS = ('pitch', 'duration', 'start', 'velocity', 'is_rest', 'original_time_sig')
+
+# Packed per-note record: six small fields in 22 bytes instead of six dict
+# entries per note, so whole patterns sort and concatenate as arrays.
+_NOTE_DTYPE = np.dtype([
+    ('pitch', 'i2'),
+    ('duration', 'f4'),
+    ('start', 'f4'),
+    ('velocity', 'i2'),
+    ('is_rest', '?'),
+    ('original_time_sig', 'U8')
+])
+
+# Chord styles as small ints so the per-song dispatch is one integer
+# index instead of string compares, mirroring the guitar kernel's
+# integer pattern families.
+STYLE_BLOCK = 0
+STYLE_ARPEGGIO = 1
+STYLE_BROKEN = 2
+
+_STYLE_NAMES = ('block', 'arpeggio', 'broken')
+
+# Per chord-style parameters, indexed by style id:
+# (split_voices, stride, leading_root). The three styles differ only in
+# whether the chord's duration is split across the voices, how far the
+# voices are staggered, and whether a low root leads, so one expansion
+# path covers them all.
+_STYLE_PARAMS = (
+    (False, 0.0, False),
+    (True, 0.1, False),
+    (True, 0.2, True)
+)
+
+PianoVariation = namedtuple('PianoVariation', ('chord_style', 'velocity'))
+
+# Song-level variation candidates, built once and shared by all Piano
+# instances instead of reconstructed on every new-song call.
+_PIANO_VARIATIONS = (
+    PianoVariation(STYLE_BLOCK, 75),
+    PianoVariation(STYLE_ARPEGGIO, 70),
+    PianoVariation(STYLE_BROKEN, 72)
+)
+
+
+class Piano(BaseInstrument):
+    """Piano with melody plus chord accompaniment styles."""
+
+    def __init__(self, program=0, seed=None):
+        super().__init__(program=program)
+        # Instance-local RNG: skips the module-global Mersenne Twister's
+        # lock and lookup, and an explicit seed makes batch runs
+        # reproducible, matching the other instruments.
+        self._rng = random.Random(seed)
+
+    def get_playable_range(self):
+        return (21, 108)
+
+    def _vectorize_melody(self, melody, current_time, ts_scale):
+        """Pack one measure's melody notes into parallel numpy arrays.
+
+        One pass over the note dicts fills preallocated arrays, then the
+        time-signature scaling, range folding and velocity clamping all
+        happen as whole-array operations instead of per-note NoteData
+        round-trips. Returns (pitches, durations, starts, velocities).
+        """
+        n = len(melody)
+        pitches = np.empty(n, dtype=np.int64)
+        durations = np.empty(n, dtype=np.float64)
+        starts = np.empty(n, dtype=np.float64)
+        velocities = np.empty(n, dtype=np.int64)
+        for i, note_data in enumerate(melody):
+            pitches[i] = note_data['pitch']
+            durations[i] = note_data['duration']
+            starts[i] = note_data['start']
+            velocities[i] = note_data.get('velocity', 80)
+
+        durations *= ts_scale
+        starts = current_time + starts * ts_scale
+        pitches, durations, velocities = self.get_note_adjustments_batch(
+            pitches, durations, velocities)
+        return pitches, durations, starts, velocities
+
+    def generate_pattern_array(self, song_data, style=None, genre=None,
+                               is_new_song=False):
+        """Generate the song's piano pattern as a packed structured array.
+
+        Returns an ndarray of _NOTE_DTYPE records; this is the fast path,
+        with generate_pattern as the dict-emitting wrapper around it.
+        Downstream code can merge patterns across instruments with
+        np.concatenate and sort them with argsort instead of touching
+        per-note Python objects.
+        """
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Generating piano pattern in %s style", style or 'classical')
+
+        original_time_sig = song_data.get('time_signature', '4/4')
+        measures = song_data.get('measures', [])
+        # The time signature is fixed for the whole song and conversion is
+        # a plain multiply, so the factor is resolved once up front instead
+        # of a method call per note and chord.
+        ts_scale = self.time_signature_factors.get(original_time_sig, 1.0)
+
+        if is_new_song or self.current_song_variation is None:
+            self.current_song_variation = self._rng.choice(_PIANO_VARIATIONS)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Selected piano variation: %s",
+                            _STYLE_NAMES[self.current_song_variation.chord_style])
+        pattern_config = self.current_song_variation
+        split_voices, stride, leading_root = _STYLE_PARAMS[pattern_config.chord_style]
+        min_pitch, max_pitch = self.get_playable_range()
+        # The chord velocity comes from the variation and never changes
+        # within a song, so it is clamped once here rather than per chord.
+        const_vel = self.normalize_velocity(pattern_config.velocity)
+
+        # Four preallocated arrays accumulate the whole song, sized from an
+        # upper bound (largest voicing plus the broken style's leading
+        # root) and truncated to the fill cursor at the end, so the output
+        # never reallocates mid-song. The per-note dicts are built once at
+        # the end from the shared key template.
+        capacity = sum(len(measure.get('melody', []))
+                       + 5 * len(measure.get('chords', []))
+                       for measure in measures)
+        pitches = np.empty(capacity, dtype=np.int64)
+        durations = np.empty(capacity, dtype=np.float64)
+        starts = np.empty(capacity, dtype=np.float64)
+        velocities = np.empty(capacity, dtype=np.int64)
+        k = 0
+        # Songs repeat the same few (root, type) chords; one local dict hit
+        # per repeat beats even the lru_cache behind get_chord_notes.
+        chord_cache = {}
+        # The measure walk only gathers chord metadata; the voicings are
+        # flattened CSR-style and the whole song's chords expand in one
+        # parallel kernel call after the loop.
+        voicing_parts = []
+        voicing_counts = []
+        chord_roots = []
+        base_parts = []
+        raw_dur_parts = []
+        current_time = 0.0
+        for measure in measures:
+            melody = measure.get('melody', [])
+            chords = measure.get('chords', [])
+
+            if melody:
+                m_pitches, m_durs, m_starts, m_vels = self._vectorize_melody(
+                    melody, current_time, ts_scale)
+                n = len(m_pitches)
+                pitches[k:k + n] = m_pitches
+                durations[k:k + n] = m_durs
+                starts[k:k + n] = m_starts
+                velocities[k:k + n] = m_vels
+                k += n
+
+            if chords:
+                # Convert every chord's start and duration for the measure
+                # in two array multiplies instead of scalar arithmetic per
+                # chord; the voicings themselves are cached as arrays so
+                # repeats skip the tuple-to-ndarray conversion too.
+                n_chords = len(chords)
+                raw_starts = np.empty(n_chords, dtype=np.float64)
+                raw_durs = np.empty(n_chords, dtype=np.float64)
+                for j, chord in enumerate(chords):
+                    raw_starts[j] = chord['start']
+                    raw_durs[j] = chord['duration']
+                    chord_key = (chord['root'], chord['type'])
+                    voicing = chord_cache.get(chord_key)
+                    if voicing is None:
+                        voicing = chord_cache[chord_key] = np.asarray(
+                            self.get_chord_notes(*chord_key), dtype=np.int64)
+                    voicing_parts.append(voicing)
+                    voicing_counts.append(len(voicing))
+                    chord_roots.append(chord['root'])
+                base_parts.append(current_time + raw_starts * ts_scale)
+                raw_dur_parts.append(raw_durs)
+
+            current_time += 4.0 * ts_scale
+
+        if voicing_parts:
+            voicings = np.concatenate(voicing_parts)
+            counts = np.asarray(voicing_counts, dtype=np.int64)
+            voicing_offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+            np.cumsum(counts, out=voicing_offsets[1:])
+            # Exclusive scan of the per-chord note counts gives each chord
+            # a disjoint output slice, so the kernel can expand them with
+            # prange and no locks.
+            out_offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+            np.cumsum(counts + (1 if leading_root else 0),
+                      out=out_offsets[1:])
+            raw_durs = np.concatenate(raw_dur_parts)
+            conv_durs = raw_durs * ts_scale
+            voice_durs = raw_durs / counts if split_voices else conv_durs
+            root_pitches = np.asarray(chord_roots, dtype=np.int64) - 12
+            c_pitches, c_durs, c_starts = _piano_kernels.expand_chords(
+                voicings, voicing_offsets, out_offsets,
+                np.concatenate(base_parts), voice_durs, conv_durs,
+                root_pitches, stride, leading_root, min_pitch, max_pitch)
+            n = len(c_pitches)
+            pitches[k:k + n] = c_pitches
+            durations[k:k + n] = c_durs
+            starts[k:k + n] = c_starts
+            velocities[k:k + n] = const_vel
+            k += n
+
+        out = np.empty(k, dtype=_NOTE_DTYPE)
+        out['pitch'] = pitches[:k]
+        out['duration'] = durations[:k]
+        out['start'] = starts[:k]
+        out['velocity'] = velocities[:k]
+        out['is_rest'] = False
+        out['original_time_sig'] = original_time_sig
+        return out
+
+    def generate_pattern(self, song_data, style=None, genre=None, is_new_song=False):
+        """Generate piano events for the whole song as a list of dicts."""
+        out = self.generate_pattern_array(song_data, style, genre, is_new_song)
+        original_time_sig = song_data.get('time_signature', '4/4')
+        return [dict(zip(_KEYS, (p, d, s, v, False, original_time_sig)))
+                for p, d, s, v in zip(out['pitch'].tolist(), out['duration'].tolist(),
+                                      out['start'].tolist(), out['velocity'].tolist())]
@@ -0,0 +1,1359 @@
+from midiutil import MIDIFile
+import os
+import re
+from pathlib import Path
+from datetime import datetime
+import random
+from src.genre_manager import GenreManager
+import argparse
+import sys
+import math
+import traceback
+
+class MusicTheory:
+    """Music theory tools to ensure proper chord selection and progression"""
+
+    def __init__(self):
+        # Define scale degrees for major and minor scales
+        self.scales = {
+            'major': [0, 2, 4, 5, 7, 9, 11],
+            'minor': [0, 2, 3, 5, 7, 8, 10]
+        }
+
+        # Define chord types for each scale degree in major keys
+        self.major_degree_chords = {
+            0: 'major',       # I
+            1: 'minor',       # ii
+            2: 'minor',       # iii
+            3: 'major',       # IV
+            4: 'major',       # V
+            5: 'minor',       # vi
+            6: 'diminished'   # vii
+        }
+
+        # Define chord types for each scale degree in minor keys
+        self.minor_degree_chords = {
+            0: 'minor',       # i
+            1: 'diminished',  # ii
+            2: 'major',       # III
+            3: 'minor',       # iv
+            4: 'minor',       # v
+            5: 'major',       # VI
+            6: 'major'        # VII
+        }
+
+        # Define intervals for common chord types
+        self.chord_types = {
+            'major': [0, 4, 7],
+            'minor': [0, 3, 7],
+            'diminished': [0, 3, 6],
+            'augmented': [0, 4, 8],
+            'dominant7': [0, 4, 7, 10],
+            'major7': [0, 4, 7, 11],
+            'minor7': [0, 3, 7, 10]
+        }
+
+        # Common chord progressions by scale degree (0-indexed)
+        self.chord_progressions = {
+            'basic': [0, 4, 5, 0],          # I-V-vi-I
+            'pop': [0, 4, 5, 3],            # I-V-vi-IV
+            'classical': [0, 3, 4, 0],      # I-IV-V-I
+            'jazz': [1, 4, 0, 5],           # ii-V-I-vi
+            'blues': [0, 0, 0, 0, 3, 3, 0, 0, 4, 3, 0, 0]  # 12-bar blues
+        }
+
+        # Map of which chords work well together (for transitions)
+        self.chord_relationships = {
+            0: [1, 2, 3, 4, 5, 6],  # I can go to any chord
+            1: [0, 2, 4],           # ii goes well to I, iii, V
+            2: [0, 3, 5],           # iii goes well to I, IV, vi
+            3: [0, 1, 4, 6],        # IV goes well to I, ii, V, vii
+            4: [0, 3, 5],           # V goes well to I, IV, vi
+            5: [1, 3, 4],           # vi goes well to ii, IV, V
+            6: [0]                  # vii goes well to I
+        }
+
+    def get_note_in_scale(self, note, key, scale_type='major'):
+        """Check if a note belongs to the given scale"""
+        # Convert note and key to pitch classes (0-11)
+        note_class = note % 12
+        key_class = key % 12
+
+        # Get the scale intervals
+        scale_intervals = self.scales[scale_type]
+
+        # Check if the note is in the scale
+        for interval in scale_intervals:
+            if (key_class + interval) % 12 == note_class:
+                # Return the scale degree (0-indexed)
+                return scale_intervals.index(interval)
+
+        return None
+
+    def get_chord_for_note(self, note, key, scale_type='major'):
+        """Get appropriate chord for a note in the given key"""
+        # Find what scale degree the note is
+        scale_degree = self.get_note_in_scale(note, key, scale_type)
+
+        # If note is not in scale, find closest scale note
+        if scale_degree is None:
+            # Find the closest note in the scale
+            scale = [(key + interval) % 12 for interval in self.scales[scale_type]]
+            distances = [(note - scale_note) % 12 for scale_note in scale]
+            min_distance_index = distances.index(min(distances))
+            scale_degree = min_distance_index
+
+        # Get the chord type for this scale degree
+        if scale_type == 'major':
+            chord_type = self.major_degree_chords[scale_degree]
+        else:
+            chord_type = self.minor_degree_chords[scale_degree]
+
+        # Get the intervals for this chord type
+        chord_intervals = self.chord_types[chord_type]
+
+        # Calculate the root note of the chord
+        scale = self.scales[scale_type]
+        root_offset = scale[scale_degree]
+        root_note = (key + root_offset) % 12
+
+        # Build the chord
+        chord = [(root_note + interval) % 12 for interval in chord_intervals]
+
+        return {
+            'root': root_note,
+            'type': chord_type,
+            'notes': chord,
+            'scale_degree': scale_degree
+        }
+
+    def get_suitable_chord_progression(self, melody_notes, key, scale_type='major', measures=4):
+        """Generate a suitable chord progression for a melody"""
+        # Group melody notes by measure
+        measure_notes = []
+        current_measure = 0
+
+        # Organize notes by measure
+        for note in melody_notes:
+            measure = int(note['start'] // 4)
+            if measure >= len(measure_notes):
+                # Add empty measures until we reach the current one
+                while len(measure_notes) <= measure:
+                    measure_notes.append([])
+            # Add the note to its measure
+            measure_notes[measure].append(note['pitch'] % 12)
+
+        # Ensure we have enough measures
+        while len(measure_notes) < measures:
+            measure_notes.append([])
+
+        # Get the most common note in each measure to base chords on
+        representative_notes = []
+        for measure in measure_notes:
+            if not measure:
+                # If no notes in this measure, use the key note
+                representative_notes.append(key % 12)
+                continue
+
+            # Count occurrences of each note
+            note_counts = {}
+            for note in measure:
+                note_counts[note] = note_counts.get(note, 0) + 1
+
+            # Get the most common note
+            most_common = max(note_counts, key=note_counts.get)
+            representative_notes.append(most_common)
+
+        # Generate chords for each measure
+        chord_progression = []
+        prev_chord_degree = None
+
+        for note in representative_notes:
+            # Get the chord for this note
+            chord = self.get_chord_for_note(note, key, scale_type)
+
+            # Check if this chord follows well from the previous chord
+            if prev_chord_degree is not None:
+                # If the chord doesn't follow well, try to find a better one
+                if chord['scale_degree'] not in self.chord_relationships.get(prev_chord_degree, []):
+                    # Try chords that work well after the previous chord
+                    for degree in self.chord_relationships[prev_chord_degree]:
+                        alt_chord = self.get_chord_for_scale_degree(degree, key, scale_type)
+                        # If the melody note fits in this chord, use it
+                        if note % 12 in alt_chord['notes']:
+                            chord = alt_chord
+                            break
+
+            chord_progression.append(chord)
+            prev_chord_degree = chord['scale_degree']
+
+        return chord_progression
+
+    def get_chord_for_scale_degree(self, degree, key, scale_type='major'):
+        """Get the chord for a specific scale degree in the given key"""
+        # Get the chord type for this scale degree
+        if scale_type == 'major':
+            chord_type = self.major_degree_chords[degree]
+        else:
+            chord_type = self.minor_degree_chords[degree]
+
+        # Get the intervals for this chord type
+        chord_intervals = self.chord_types[chord_type]
+
+        # Calculate the root note of the chord
+        scale = self.scales[scale_type]
+        root_offset = scale[degree]
+        root_note = (key + root_offset) % 12
+
+        # Build the chord
+        chord = [(root_note + interval) % 12 for interval in chord_intervals]
+
+        return {
+            'root': root_note,
+            'type': chord_type,
+            'notes': chord,
+            'scale_degree': degree
+        }
+
+class MIDIGenerator:
+    def __init__(self):
+        # Note to MIDI number mapping
+        self.note_to_midi = {
+            'C': 0, 'D': 2, 'E': 4, 'F': 5, 'G': 7, 'A': 9, 'B': 11
+        }
+
+        # Duration to beats mapping
+        self.duration_to_beats = {
+            'whole': 4.0,
+            'half': 2.0,
+            'quarter': 1.0,
+            'eighth': 0.5,
+            'sixteenth': 0.25,
+            'thirtysecond': 0.125
+        }
+
+        # Dynamics to velocity mapping
+        self.dynamics_to_velocity = {
+            'pp': 20,
+            'p': 40,
+            'mp': 60,
+            'mf': 80,
+            'f': 100,
+            'ff': 120
+        }
+
+    def note_to_midi_number(self, note_str):
+        """Convert note string (e.g., 'A4') to MIDI number"""
+        match = re.match(r'([A-G])(\d+)', note_str)
+        if match:
+            note, octave = match.groups()
+            midi_number = self.note_to_midi[note] + (int(octave) + 1) * 12
+            return midi_number
+        return None
+
+    def parse_duration(self, duration_str):
+        """Convert duration string to beats"""
+        return self.duration_to_beats.get(duration_str, 1.0)
+
+    def parse_dynamics(self, dynamics_str):
+        """Convert dynamics string to velocity"""
+        return self.dynamics_to_velocity.get(dynamics_str, 80)
+
+    def create_midi_file(self, song_data, output_path, tempo=120, enable_accompaniment=False, accompaniment_style='basic'):
+        """Create a MIDI file from song data with optional accompaniment"""
+        try:
+            print(f"\nCreating MIDI file: {output_path}")
+            print(f"Tempo: {tempo}")
+            print(f"Number of measures: {len(song_data['measures'])}")
+            print(f"Accompaniment: {'Enabled (' + accompaniment_style + ')' if enable_accompaniment else 'Disabled'}")
+
+            # Create MIDI file with one or two tracks
+            num_tracks = 2 if enable_accompaniment else 1
+            midi = MIDIFile(num_tracks, adjust_origin=True)
+
+            # Set up the melody track
+            midi.addTempo(0, 0, tempo)
+            if enable_accompaniment:
+                midi.addTempo(1, 0, tempo)
+
+            # Process melody notes
+            current_time = 0
+            total_notes = 0
+
+            for measure_num, measure in enumerate(song_data['measures'], 1):
+                print(f"\nProcessing measure {measure_num}")
+
+                # Group notes by start time within the measure
+                measure_notes = []
+
+                # First pass: collect all notes in the measure
+                for note_data in measure:
+                    if isinstance(note_data, list):
+                        for pitch_data in note_data:
+                            measure_notes.append({
+                                'pitch': pitch_data['pitch'],
+                                'duration': pitch_data['duration'],
+                                'velocity': pitch_data['velocity'],
+                                'start': pitch_data['start'],
+                                'is_chord': True
+                            })
+                    else:
+                        measure_notes.append({
+                            'pitch': note_data['pitch'],
+                            'duration': note_data['duration'],
+                            'velocity': note_data['velocity'],
+                            'start': note_data['start'],
+                            'is_chord': False
+                        })
+
+                # Sort notes by start time
+                measure_notes.sort(key=lambda x: (x['start'], x['is_chord']))
+                print(f"Measure {measure_num} has {len(measure_notes)} notes")
+
+                # Process notes in order
+                current_start = -1
+                current_chord = []
+
+                for note in measure_notes:
+                    if note['start'] != current_start:
+                        # Process any pending chord
+                        if current_chord:
+                            # Add all notes in the chord
+                            note_start = current_time + current_start
+
+                            # Add each note in the chord
+                            for chord_note in current_chord:
+                                # Ensure values are within valid MIDI ranges
+                                pitch_value = max(0, min(127, chord_note['pitch']))
+                                velocity = max(0, min(127, chord_note['velocity']))
+                                duration = max(0.1, chord_note['duration'])
+
+                                midi.addNote(0, 0, pitch_value, note_start, duration, velocity)
+                                total_notes += 1
+                                print(f"Added chord note: pitch {pitch_value}, start {note_start}, duration {duration}, velocity {velocity}")
+
+                            current_chord = []
+
+                        current_start = note['start']
+
+                    if note['is_chord']:
+                        current_chord.append(note)
+                    else:
+                        # Process single note immediately
+                        note_start = current_time + note['start']
+
+                        # Ensure values are within valid MIDI ranges
+                        pitch_value = max(0, min(127, note['pitch']))
+                        velocity = max(0, min(127, note['velocity']))
+                        duration = max(0.1, note['duration'])
+
+                        midi.addNote(0, 0, pitch_value, note_start, duration, velocity)
+                        total_notes += 1
+                        print(f"Added single note: pitch {pitch_value}, start {note_start}, duration {duration}, velocity {velocity}")
+
+                # Process any remaining chord at the end of the measure
+                if current_chord:
+                    note_start = current_time + current_start
+                    for chord_note in current_chord:
+                        pitch_value = max(0, min(127, chord_note['pitch']))
+                        velocity = max(0, min(127, chord_note['velocity']))
+                        duration = max(0.1, chord_note['duration'])
+
+                        midi.addNote(0, 0, pitch_value, note_start, duration, velocity)
+                        total_notes += 1
+                        print(f"Added final chord note: pitch {pitch_value}, start {note_start}, duration {duration}, velocity {velocity}")
+
+                # Move to next measure
+                current_time += 4.0
+
+            # Generate accompaniment if enabled
+            if enable_accompaniment:
+                print("\nGenerating accompaniment...")
+
+                # Create accompaniment generator
+                accompaniment_gen = AccompanimentGenerator()
+
+                # Generate accompaniment data
+                accompaniment_data = accompaniment_gen.generate_accompaniment(song_data, style=accompaniment_style)
+
+                # Add accompaniment notes to track 1
+                current_time = 0
+                accompaniment_notes = 0
+
+                for measure_num, measure in enumerate(accompaniment_data, 1):
+                    print(f"Processing accompaniment for measure {measure_num}")
+
+                    # Add each note in the accompaniment measure
+                    for note_data in measure:
+                        note_start = current_time + note_data['start']
+
+                        # Ensure values are within valid MIDI ranges
+                        pitch_value = max(0, min(127, note_data['pitch']))
+                        velocity = max(0, min(127, note_data['velocity']))
+                        duration = max(0.1, note_data['duration'])
+
+                        midi.addNote(1, 0, pitch_value, note_start, duration, velocity)
+                        accompaniment_notes += 1
+
+                    # Move to next measure
+                    current_time += 4.0
+
+                print(f"Added {accompaniment_notes} accompaniment notes")
+                total_notes += accompaniment_notes
+
+            # Write the MIDI file
+            with open(output_path, 'wb') as output_file:
+                midi.writeFile(output_file)
+
+            print("\nMIDI file created successfully:")
+            print(f"Total measures: {len(song_data['measures'])}")
+            print(f"Total notes: {total_notes}")
+            print(f"Output file: {output_path}")
+            return True
+        except Exception as e:
+            print(f"Error creating MIDI file: {e}")
+            import traceback
+            print("Traceback:")
+            traceback.print_exc()
+            return False
+
+class AccompanimentGenerator:
+    """Generates accompaniment patterns based on melody notes"""
+
+    def __init__(self):
+        # Basic chord patterns (intervals from root note)
+        self.chord_patterns = {
+            'basic': [0, 4, 7],           # Major triad
+            'seventh': [0, 4, 7, 10],     # Dominant seventh
+            'open': [0, 7, 12],           # Open fifth and octave
+            'sus4': [0, 5, 7],            # Suspended fourth
+            'add9': [0, 4, 7, 14]         # Added ninth
+        }
+
+        # Rhythm patterns as [start_beat, duration] pairs
+        self.rhythm_patterns = {
+            'whole': [[0.0, 4.0]],
+            'half': [[0.0, 2.0], [2.0, 2.0]],
+            'quarter': [[0.0, 1.0], [1.0, 1.0], [2.0, 1.0], [3.0, 1.0]],
+            'waltz': [[0.0, 1.0], [1.0, 1.0], [2.0, 1.0], [3.0, 1.0]],
+            'arpeggio': [[0.0, 0.5], [0.5, 0.5], [1.0, 0.5], [1.5, 0.5],
+                         [2.0, 0.5], [2.5, 0.5], [3.0, 0.5], [3.5, 0.5]],
+            'alberti': [[0.0, 0.5], [0.5, 0.5], [1.0, 0.5], [1.5, 0.5],
+                        [2.0, 0.5], [2.5, 0.5], [3.0, 0.5], [3.5, 0.5]]
+        }
+
+        # Note name to scale degree mapping
+        self.note_to_degree = {
+            'C': 0, 'D': 2, 'E': 4, 'F': 5, 'G': 7, 'A': 9, 'B': 11
+        }
+
+        # Music theory helper for chord selection
+        self.music_theory = MusicTheory()
+
+        # Genre manager for genre-specific patterns
+        self.genre_manager = GenreManager()
+
+    def detect_key(self, song_data):
+        """Attempts to detect the key from the melody notes or metadata"""
+        # First check if key is specified in song data
+        if 'key' in song_data and song_data['key']:
+            key_str = song_data['key'].strip()
+            # Parse key string like "C major" or "A minor"
+            key_match = re.match(r'([A-G][#b]?)\s*(major|minor|maj|min)?', key_str, re.IGNORECASE)
+            if key_match:
+                root_note = key_match.group(1)
+                # Convert root note to pitch class
+                if root_note in self.note_to_degree:
+                    return self.note_to_degree[root_note]
+
+        # Otherwise, analyze the melody notes
+        notes = []
+        for measure in song_data['measures']:
+            for note_data in measure:
+                if isinstance(note_data, list):
+                    for note in note_data:
+                        notes.append(note['pitch'] % 12)
+                else:
+                    notes.append(note_data['pitch'] % 12)
+
+        if not notes:
+            return 0  # Default to C
+
+        # Count note occurrences
+        note_counts = {}
+        for note in notes:
+            note_counts[note] = note_counts.get(note, 0) + 1
+
+        # The most common note is likely the key
+        if note_counts:
+            return max(note_counts, key=note_counts.get)
+        return 0
+
+    def detect_scale_type(self, song_data, key):
+        """Determines if the song is in a major or minor key"""
+        # First check if scale type is specified in song data
+        if 'key' in song_data and song_data['key']:
+            key_str = song_data['key'].strip().lower()
+            if 'minor' in key_str or 'min' in key_str:
+                return 'minor'
+            else:
+                return 'major'
+
+        # Otherwise, analyze the melody notes
+        major_count = 0
+        minor_count = 0
+
+        # Collect all melody notes
+        all_notes = []
+        for measure in song_data['measures']:
+            for note_data in measure:
+                if isinstance(note_data, list):
+                    for note in note_data:
+                        all_notes.append(note['pitch'] % 12)
+                else:
+                    all_notes.append(note_data['pitch'] % 12)
+
+        # Count notes that fit major and minor scales
+        for note in all_notes:
+            # Check if note is in major scale
+            if self.music_theory.get_note_in_scale(note, key, 'major') is not None:
+                major_count += 1
+
+            # Check if note is in minor scale
+            if self.music_theory.get_note_in_scale(note, key, 'minor') is not None:
+                minor_count += 1
+
+        # Return the scale type with more matching notes
+        return 'minor' if minor_count > major_count else 'major'
+
+    def generate_chord_progression(self, song_data, key, scale_type='major'):
+        """Generate a chord progression based on melody notes and music theory"""
+        # Collect all melody notes
+        all_notes = []
+        for measure in song_data['measures']:
+            for note_data in measure:
+                if isinstance(note_data, list):
+                    for note in note_data:
+                        all_notes.append(note)
+                else:
+                    all_notes.append(note_data)
+
+        # Use music theory to generate a suitable progression
+        return self.music_theory.get_suitable_chord_progression(
+            all_notes,
+            key,
+            scale_type,
+            measures=len(song_data['measures'])
+        )
+
+    def build_chord_notes(self, chord, octave=3):
+        """Convert a chord dictionary to MIDI note numbers in a specific octave"""
+        base_note = octave * 12
+        midi_notes = []
+
+        for note in chord['notes']:
+            midi_notes.append(base_note + note)
+
+        return midi_notes
+
+    def generate_accompaniment(self, song_data, style='basic', genre_id='classical'):
+        """Generate accompaniment based on melody, chosen style, and genre"""
+        # Detect the key and scale type
+        key = self.detect_key(song_data)
+        scale_type = self.detect_scale_type(song_data, key)
+
+        print(f"Detected key: {key}, Scale type: {scale_type}, Genre: {genre_id}")
+
+        # Get the genre object
+        genre = self.genre_manager.get_genre(genre_id)
+
+        # Determine the rhythm pattern to use
+        if style == 'genre':
+            # Use genre-specific pattern
+            pattern_type = genre.get_accompaniment_pattern()
+            rhythm = genre.get_rhythm_pattern(pattern_type)
+            print(f"Using genre-specific '{pattern_type}' pattern")
+        else:
+            # Use the specified style pattern
+            if style in self.rhythm_patterns:
+                rhythm = self.rhythm_patterns[style]
+            else:
+                rhythm = self.rhythm_patterns['quarter']
+            print(f"Using specified '{style}' pattern")
+
+        # Generate the chord progression
+        chord_progression = self.generate_chord_progression(song_data, key, scale_type)
+
+        # If using genre style, try to use the genre's chord progression instead
+        if style == 'genre' and genre.chord_progressions:
+            progression_length = len(song_data['measures'])
+            genre_progression = genre.get_chord_progression(progression_length)
+            # Convert scale degrees to actual chords
+            genre_chords = []
+            for degree in genre_progression:
+                genre_chords.append(self.music_theory.get_chord_for_scale_degree(degree, key, scale_type))
+
+            # Use the genre progression if it covers all measures
+            if len(genre_chords) >= progression_length:
+                chord_progression = genre_chords[:progression_length]
+                print("Using genre-specific chord progression")
+
+        # Build the accompaniment measures
+        accompaniment = []
+
+        for measure_idx, measure in enumerate(song_data['measures']):
+            measure_notes = []
+
+            # Skip empty measures
+            if not measure:
+                accompaniment.append([])
+                continue
+
+            # Get the chord for this measure
+            if measure_idx < len(chord_progression):
+                chord = chord_progression[measure_idx]
+            else:
+                chord = chord_progression[-1] if chord_progression else self.music_theory.get_chord_for_scale_degree(0, key, scale_type)
+
+            # Build the chord notes in a low octave
+            chord_notes = self.build_chord_notes(chord, octave=2)
+
+            print(f"Measure {measure_idx + 1}: Chord {chord['type']} (Scale degree: {chord['scale_degree']})")
+
+            # Determine the velocity for this measure
+            if style == 'genre':
+                velocity = self.get_velocity_for_genre(genre)
+            else:
+                velocity = 60
+                if style in ('arpeggio', 'alberti'):
+                    velocity = 50
+
+            # Add notes according to the rhythm pattern
+            for start, duration in rhythm:
+                # Single-note patterns play one chord tone at a time
+                if style in ('arpeggio', 'alberti') or (style == 'genre' and pattern_type in ('arpeggio', 'alberti', 'walking', 'swing')):
+                    # Skip if there are no chord notes
+                    if not chord_notes:
+                        continue
+
+                    # Pick which chord note to play
+                    if style == 'arpeggio' or (style == 'genre' and pattern_type in ('arpeggio', 'walking')):
+                        index = int(start * 2) % len(chord_notes)
+                        pitch = chord_notes[index]
+                    elif style == 'alberti' or (style == 'genre' and pattern_type == 'alberti'):
+                        if len(chord_notes) >= 3:
+                            pattern_idx = int(start * 2) % 4
+                            if pattern_idx == 0:
+                                pitch = chord_notes[0]
+                            elif pattern_idx == 1:
+                                pitch = chord_notes[-1]
+                            elif pattern_idx == 2:
+                                pitch = chord_notes[len(chord_notes) // 2]
+                            else:
+                                pitch = chord_notes[-1]
+                        else:
+                            if not chord_notes:
+                                continue
+                            pitch = chord_notes[int(start * 2) % len(chord_notes)]
+                    elif style == 'genre' and pattern_type == 'swing':
+                        index = int(start * 2) % len(chord_notes)
+                        pitch = chord_notes[index]
+                        # Accent notes on the beat
+                        if start % 1 == 0:
+                            velocity += 5
+
+                    measure_notes.append({
+                        'pitch': pitch,
+                        'duration': duration,
+                        'velocity': velocity,
+                        'start': start,
+                        'is_chord': False
+                    })
+                else:
+                    # Block chord patterns play all chord tones together
+                    for pitch in chord_notes:
+                        measure_notes.append({
+                            'pitch': pitch,
+                            'duration': duration,
+                            'velocity': velocity,
+                            'start': start,
+                            'is_chord': True
+                        })
+
+            accompaniment.append(measure_notes)
+
+        return accompaniment
+
+    def get_velocity_for_genre(self, genre):
+        """Get appropriate velocity based on genre dynamics"""
+        default_dynamic = genre.dynamics.get('default', 'mf')
+        variation = genre.dynamics.get('variation', 'low')
+
+        # Map dynamics to velocity values
+        dynamic_map = {
+            'pp': 30,
+            'p': 45,
+            'mp': 60,
+            'mf': 75,
+            'f': 90,
+            'ff': 105
+        }
+
+        # Get the base velocity
+        base_velocity = dynamic_map.get(default_dynamic, 75)
+
+        # Apply variation based on genre
+        if variation == 'high':
+            return base_velocity + random.randint(-15, 15)
+        elif variation == 'medium':
+            return base_velocity + random.randint(-10, 10)
+        else:
+            return base_velocity + random.randint(-5, 5)
+
+def validate_song_format(lines):
+    """Validate the song file format and return error messages if any"""
+    errors = []
+
+    for i, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+
+        # Skip metadata and section lines
+        if any(word in line.lower() for word in ('title:', 'key:', 'time:', 'tempo:', 'mood:', 'right', 'left', 'rh:', 'lh:', 'measure')):
+            continue
+
+        # Check note lines
+        parts = line.split()
+        if not parts:
+            continue
+
+        # Validate note format
+        note = parts[0]
+        if note.startswith('['):
+            if not note.endswith(']'):
+                errors.append(f"Line {i}: Chord must be enclosed in square brackets")
+            notes = note[1:-1].split(',')
+            for n in notes:
+                if not re.match(r'^[A-G]#?[0-9]$', n.strip()):
+                    errors.append(f"Line {i}: Invalid note in chord: {n}")
+        elif not re.match(r'^[A-G]#?[0-9]$', note):
+            errors.append(f"Line {i}: Invalid note format: {note}")
+
+    return errors
+
+def convert_to_standard_format(lines):
+    """Convert any input format to match our standard format"""
+    standardized_lines = []
+    current_measure = 1
+    measure_notes = []
+
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+
+        # Skip metadata lines
+        if any(word in line.lower() for word in ('title:', 'key:', 'time:', 'tempo:', 'mood:', 'right', 'left', 'rh:', 'lh:')):
+            continue
+
+        # Handle measure boundaries
+        if any(word in line.lower() for word in ('measure', 'bar', '|')):
+            if measure_notes:
+                standardized_lines.append(f"[Measure {current_measure}]")
+                standardized_lines.extend(measure_notes)
+                measure_notes = []
+                current_measure += 1
+            continue
+
+        # Process note lines
+        parts = line.split()
+        if not parts:
+            continue
+
+        # Extract note and duration
+        note = parts[0]
+        duration = 'quarter'
+
+        # Look for a duration word in the line
+        for word in parts:
+            if word.lower() in ('whole', 'half', 'quarter', 'eighth', 'sixteenth'):
+                duration = word.lower()
+
+        # Build the standardized note line
+        note_line = f"{note} {duration} mf"
+        measure_notes.append(note_line)
+
+    # Flush the last measure
+    if measure_notes:
+        standardized_lines.append(f"[Measure {current_measure}]")
+        standardized_lines.extend(measure_notes)
+
+    return standardized_lines
+
+def parse_song(lines):
+    """Parse song data from text lines in the new format"""
+    song_data = {
+        'title': 'Untitled',
+        'key': 'C major',
+        'time_signature': '4/4',
+        'tempo': 120,
+        'measures': []
+    }
+
+    # Parsing state
+    in_header = True
+    in_measures = False
+    current_measure = []
+
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+
+        # Parse header metadata
+        if ':' in line and in_header:
+            parts = line.split(':', 1)
+            key = parts[0].strip().lower()
+            value = parts[1].strip()
+
+            if key == 'title':
+                song_data['title'] = value
+            elif key == 'key':
+                song_data['key'] = value
+            elif key == 'time signature':
+                song_data['time_signature'] = value
+            elif key == 'tempo':
+                try:
+                    song_data['tempo'] = int(value.split()[0])
+                except (ValueError, IndexError):
+                    pass
+            continue
+
+        # Measure lines start with a pipe
+        if line.startswith('|'):
+            in_header = False
+            in_measures = True
+
+            # Split the line into measures
+            segments = [s.strip() for s in line.split('|') if s.strip()]
+
+            for segment in segments:
+                measure_notes = parse_measure(segment)
+                song_data['measures'].append(measure_notes)
+            continue
+
+        # Skip comment lines
+        if line.startswith('#'):
+            continue
+
+    # Make sure we have at least one measure
+    if not song_data['measures']:
+        song_data['measures'] = [[]]
+
+    return song_data
+
+def parse_measure(measure_text):
+    """Parse a single measure of text into note data"""
+    notes = []
+    tokens = measure_text.split()
+
+    start_time = 0.0
+
+    for token in tokens:
+        if not token:
+            continue
+
+        # Handle chords like [C4q,E4q,G4q]
+        if token.startswith('[') and token.endswith(']'):
+            chord_tokens = token[1:-1].split(',')
+            chord_notes = []
+
+            for note_token in chord_tokens:
+                note_data = parse_note(note_token.strip())
+                if note_data:
+                    note_data['start'] = start_time
+                    chord_notes.append(note_data)
+
+            if chord_notes:
+                # Advance time by the first note's duration
+                duration = chord_notes[0]['duration']
+                start_time += duration
+                notes.append(chord_notes)
+        else:
+            note_data = parse_note(token)
+            if note_data:
+                note_data['start'] = start_time
+                start_time += note_data['duration']
+                notes.append(note_data)
+
+    return notes
+
+def parse_note(note_token):
+    """Parse a note token (e.g., 'C4q', 'G#3h', 'A5s.') into note data"""
+    if not note_token:
+        return None
+
+    # Handle rests (r followed by duration)
+    if note_token.lower().startswith('r'):
+        duration_part = note_token[1:]
+        duration = parse_duration_code(duration_part)
+
+        return {
+            'pitch': 0,
+            'duration': duration,
+            'velocity': 0,
+            'is_rest': True
+        }
+
+    # Match note name, accidental, octave, duration code, and dots
+    match = re.match(r'([A-Ga-g])([#b]?)(\d+)([wWhHqQeEsS])(\.*)', note_token)
+
+    if not match:
+        return None
+
+    note, accidental, octave, duration_code, dot = match.groups()
+
+    # Convert note name to pitch class
+    note_values = {'c': 0, 'd': 2, 'e': 4, 'f': 5, 'g': 7, 'a': 9, 'b': 11}
+    pitch = note_values[note.lower()]
+
+    # Apply accidentals
+    if accidental == '#':
+        pitch += 1
+    elif accidental == 'b':
+        pitch -= 1
+
+    # Calculate MIDI pitch
+    midi_pitch = int(octave) * 12 + pitch
+
+    # Get duration in beats
+    duration = parse_duration_code(duration_code.lower() + dot)
+
+    # Default velocity
+    velocity = 80
+
+    return {
+        'pitch': midi_pitch,
+        'duration': duration,
+        'velocity': velocity,
+        'is_rest': False
+    }
+
+def parse_duration_code(duration_code):
+    """Convert duration code to actual duration in beats"""
+    # Base durations in beats
+    base_durations = {
+        'w': 4.0,
+        'h': 2.0,
+        'q': 1.0,
+        'e': 0.5,
+        's': 0.25
+    }
+
+    if not duration_code:
+        return 1.0
+
+    # Get the base duration
+    base = duration_code[0].lower()
+
+    if base not in base_durations:
+        return 1.0
+
+    duration = base_durations[base]
+
+    # Apply dots (each dot adds half the previous value)
+    dots = duration_code.count('.')
+    dot_value = duration / 2.0
+
+    for _ in range(dots):
+        duration += dot_value
+        dot_value /= 2.0
+
+    return duration
+
+def get_next_version(output_dir, base_name):
+    """Get the next version number for a file"""
+    existing_files = [f for f in os.listdir(output_dir) if f.startswith(base_name) and f.endswith('.mid')]
+    if not existing_files:
+        return 1
+
+    # Extract version numbers from existing files
+    versions = []
+    for file in existing_files:
+        try:
+            # Extract version number from filename (e.g., "song_v2.mid" -> 2)
+            version = int(file.split('_v')[1].split('.')[0])
+            versions.append(version)
+        except (IndexError, ValueError):
+            continue
+
+    return max(versions) + 1 if versions else 1
+
+def process_song(input_file, output_dir, accompaniment_style='basic', genre=None):
+    """Process a single song file"""
+    try:
+        with open(input_file, 'r') as file:
+            lines = file.readlines()
+
+        # Parse the song data
+        song_data = parse_song(lines)
+
+        # Resolve the output directory
+        if not os.path.isabs(output_dir):
+            output_dir = os.path.join(os.path.dirname(__file__), output_dir)
+
+        # Generate the MIDI file
+        output_file = generate_midi(
+            song_data,
+            output_file=None,
+            accompaniment_style=accompaniment_style,
+            genre=genre
+        )
+
+        print(f"MIDI file successfully generated: {output_file}")
+    except Exception as e:
+        print(f"Error processing {input_file}: {e}")
+        traceback.print_exc()
+
+def process_all_songs(input_dir, output_dir, accompaniment_style='basic', genre=None):
+    """Process all song files in the input directory"""
+    print(f"Processing all songs in {input_dir}")
+
+    # Resolve the directories
+    if not os.path.isabs(input_dir):
+        input_dir = os.path.join(os.path.dirname(__file__), input_dir)
+    if not os.path.isabs(output_dir):
+        output_dir = os.path.join(os.path.dirname(__file__), output_dir)
+
+    # Find all song files
+    song_files = [f for f in os.listdir(input_dir) if f.endswith('.txt')]
+
+    if not song_files:
+        print("No song files found")
+        return False
+
+    print(f"Found {len(song_files)} song files")
+
+    # Process each song
+    success_count = 0
+    total_count = 0
+
+    for file in song_files:
+        print(f"\nProcessing: {file}")
+        try:
+            total_count += 1
+            input_file = os.path.join(input_dir, file)
+            process_song(input_file, output_dir, accompaniment_style, genre)
+            success_count += 1
+        except Exception as e:
+            print(f"Error processing {file}: {e}")
+
+    print(f"\nSuccessfully processed {success_count} out of {total_count} files")
+
+def copy_template(template_name, new_name):
+    """Copy a template file to create a new song file"""
+    template_dir = os.path.join(os.path.dirname(__file__), 'input', 'templates')
+    songs_dir = os.path.join(os.path.dirname(__file__), 'input', 'songs')
+
+    # Make sure the directories exist
+    os.makedirs(template_dir, exist_ok=True)
+    os.makedirs(songs_dir, exist_ok=True)
+
+    template_file = os.path.join(template_dir, f"{template_name}.txt")
+    new_file = os.path.join(songs_dir, f"{new_name}.txt")
+
+    if not os.path.exists(template_file):
+        print(f"Template '{template_name}' not found")
+        return False
+
+    try:
+        with open(template_file, 'r') as src, open(new_file, 'w') as dst:
+            dst.write(src.read())
+        print(f"Created new song file: {new_name}.txt")
+        return True
+    except Exception as e:
+        print(f"Error copying template: {e}")
+        return False
+
+def generate_midi(song_data, output_file=None, accompaniment_style='basic', genre=None):
+    """Generate a MIDI file from the song data dictionary"""
+    # Create a MIDI file with two tracks (melody and accompaniment)
+    midi = MIDIFile(2)
+
+    # Track names
+    track_names = ['Melody', 'Accompaniment']
+
+    # Set up the time signature
+    time_signature = song_data.get('time_signature', '4/4')
+    numerator, denominator = map(int, time_signature.split('/'))
+
+    # Configure each track
+    for i, name in enumerate(track_names):
+        midi.addTrackName(i, 0, name)
+        midi.addTimeSignature(i, 0, numerator, int(math.log(denominator, 2)), 24)
+
+        # Set the tempo
+        tempo = int(song_data.get('tempo', 120))
+        midi.addTempo(i, 0, tempo)
+
+    # Set the melody instrument
+    melody_instrument = int(song_data.get('instrument', 0))
+    midi.addProgramChange(0, 0, 0, melody_instrument)
+
+    # Add the melody notes
+    time = 0
+
+    # Find the maximum velocity for normalization
+    max_velocity = 0
+    for measure in song_data['measures']:
+        for note_data in measure:
+            if isinstance(note_data, list):
+                for note in note_data:
+                    max_velocity = max(max_velocity, note.get('velocity', 100))
+            else:
+                max_velocity = max(max_velocity, note_data.get('velocity', 100))
+
+    if max_velocity == 0:
+        max_velocity = 100
+
+    for measure_idx, measure in enumerate(song_data['measures']):
+        measure_start_time = time
+        measure_end_time = time
+
+        # Add each note in the measure
+        for note_data in measure:
+            if isinstance(note_data, list):
+                # This is a chord - all notes start at the same time
+                chord_start = note_data[0].get('start', 0) + time
+
+                for note in note_data:
+                    # Get note properties
+                    pitch = note.get('pitch', 60)
+                    duration = note.get('duration', 1.0)
+                    # Normalize velocity
+                    velocity = int(min(100, note.get('velocity', 90) / max_velocity * 100))
+
+                    midi.addNote(0, 0, pitch, chord_start, duration, velocity)
+                    measure_end_time = max(measure_end_time, chord_start + duration)
+            else:
+                # Single note
+                pitch = note_data.get('pitch', 60)
+                duration = note_data.get('duration', 1.0)
+                start = note_data.get('start', 0) + time
+                # Normalize velocity
+                velocity = int(min(100, note_data.get('velocity', 90) / max_velocity * 100))
+
+                midi.addNote(0, 0, pitch, start, duration, velocity)
+                measure_end_time = max(measure_end_time, start + duration)
+
+        # Advance time to the end of the measure
+        time = measure_end_time
+
+    # Generate accompaniment unless disabled
+    if accompaniment_style != 'none':
+        # Use the specified genre or default to classical
+        genre_id = genre if genre else 'classical'
+
+        accompaniment_generator = AccompanimentGenerator()
+
+        # Set the accompaniment instrument based on genre
+        if genre:
+            genre_obj = accompaniment_generator.genre_manager.get_genre(genre)
+            if genre_obj:
+                instrument = genre_obj.get_instrument()
+                midi.addProgramChange(1, 0, 0, instrument)
+                print(f"Using genre-specific instrument: {instrument}")
+            else:
+                midi.addProgramChange(1, 0, 0, 32)
+        else:
+            midi.addProgramChange(1, 0, 0, 32)
+
+        accompaniment = accompaniment_generator.generate_accompaniment(
+            song_data,
+            style=accompaniment_style,
+            genre_id=genre_id
+        )
+
+        # Add the accompaniment notes
+        time = 0
+        for measure_idx, measure in enumerate(accompaniment):
+            if not measure:
+                # Keep time moving for empty measures
+                if measure_idx < len(song_data['measures']):
+                    melody_measure = song_data['measures'][measure_idx]
+                    measure_duration = 0
+                    for note_data in melody_measure:
+                        if isinstance(note_data, list):
+                            for note in note_data:
+                                measure_duration = max(measure_duration,
+                                                       note.get('start', 0) + note.get('duration', 1.0))
+                        else:
+                            measure_duration = max(measure_duration,
+                                                   note_data.get('start', 0) + note_data.get('duration', 1.0))
+                    time += measure_duration
+                else:
+                    time += numerator
+                continue
+
+            measure_start_time = time
+            measure_end_time = time
+
+            # Add each note in the accompaniment measure
+            for note_data in measure:
+                pitch = note_data.get('pitch', 48)
+                duration = note_data.get('duration', 1.0)
+                start = note_data.get('start', 0) + time
+                velocity = note_data.get('velocity', 70)
+
+                midi.addNote(1, 0, pitch, start, duration, velocity)
+                measure_end_time = max(measure_end_time, start + duration)
+
+            time = measure_end_time
+
+    # Determine the output file path
+    if output_file is None:
+        output_dir = os.path.join(os.path.dirname(__file__), 'output')
+        os.makedirs(output_dir, exist_ok=True)
+
+        # Build a filename from the song title
+        title = song_data.get('title', 'Untitled')
+        if not title:
+            title = 'Untitled'
+
+        # Sanitize the title for use as a filename
+        title = re.sub(r'[^\w\s-]', '', title.strip().lower())
+        title = re.sub(r'[-\s]+', '-', title)
+
+        # Include the style in the filename
+        filename = f"{title}_{accompaniment_style}"
+
+        # Include the genre if specified
+        if genre:
+            filename += f"_{genre}"
+
+        # Add a timestamp to avoid collisions
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        filename += f"_{timestamp}.mid"
+
+        output_file = os.path.join(output_dir, filename)
+
+    # Write the MIDI file
+    with open(output_file, 'wb') as output_file_obj:
+        midi.writeFile(output_file_obj)
+
+    return output_file
+
+def main():
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    input_dir = os.path.join(base_dir, 'input', 'songs')
+    output_dir = os.path.join(base_dir, 'output')
+
+    # Make sure the directories exist
+    os.makedirs(input_dir, exist_ok=True)
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Find all song files
+    song_files = [f for f in os.listdir(input_dir) if f.endswith('.txt')]
+
+    if not song_files:
+        print('No song files found in input/songs directory')
+        print('Please add your song files to the input/songs directory')
+        return
+
+    print('\nAvailable songs:')
+    for i, file in enumerate(song_files, 1):
+        print(f"{i}. {file}")
+
+    print('\nOptions:')
+    print('1. Convert a specific song')
+    print('2. Convert all songs')
+
+    while True:
+        try:
+            choice = input('\nEnter your choice (1 or 2): ').strip()
+            if choice in ('1', '2'):
+                break
+            else:
+                print('Please enter 1 or 2')
+        except ValueError:
+            print('Please enter 1 or 2')
+
+    print('\nWould you like to add automatic accompaniment to your song?')
+    print('This will generate a chord-based accompaniment track based on the melody')
+    accomp_choice = input('Add accompaniment? (y/n): ').strip().lower()
+    enable_accompaniment = accomp_choice.startswith('y')
+
+    accompaniment_style = 'basic' if enable_accompaniment else 'none'
+    genre = None
+
+    if enable_accompaniment:
+        print('\nChoose an accompaniment style:')
+        print('1. Basic (block chords)')
+        print('2. Arpeggio (broken chords)')
+        print('3. Alberti bass (classical piano style)')
+        print('4. Waltz (3/4 feel)')
+        print('5. Genre-specific style')
+
+        style_choice = input('\nEnter your choice (1-5): ').strip()
+        if style_choice == '2':
+            accompaniment_style = 'arpeggio'
+        elif style_choice == '3':
+            accompaniment_style = 'alberti'
+        elif style_choice == '4':
+            accompaniment_style = 'waltz'
+        elif style_choice == '5':
+            accompaniment_style = 'genre'
+
+            print('\nChoose a musical genre:')
+            print('1. Classical')
+            print('2. Baroque')
+            print('3. Romantic')
+            print('4. Pop')
+            print('5. Rock')
+            print('6. Jazz')
+            print('7. Swing')
+
+            genre_choice = input('\nEnter your choice (1-7): ').strip()
+            genre_map = {
+                '1': 'classical',
+                '2': 'baroque',
+                '3': 'romantic',
+                '4': 'pop',
+                '5': 'rock',
+                '6': 'jazz',
+                '7': 'swing'
+            }
+            genre = genre_map.get(genre_choice, 'classical')
+        else:
+            accompaniment_style = 'basic'
+
+        print(f"Selected accompaniment style: {accompaniment_style}")
+        if genre:
+            print(f"Selected genre: {genre}")
+
+    if choice == '1':
+        while True:
+            try:
+                print('\nEnter the number of the song to convert (1-{})'.format(len(song_files)))
+                song_choice = input('> ').strip()
+                song_choice = int(song_choice) - 1
+                if 0 <= song_choice < len(song_files):
+                    break
+                else:
+                    print(f"Please enter a number between 1 and {len(song_files)}")
+            except ValueError:
+                print('Please enter a valid number')
+
+        input_file = os.path.join(input_dir, song_files[song_choice])
+        print(f"\nConverting: {song_files[song_choice]}")
+        process_song(input_file, output_dir, accompaniment_style, genre)
+    else:
+        print('\nConverting all songs...')
+        for song_file in song_files:
+            input_file = os.path.join(input_dir, song_file)
+            print(f"\nConverting: {song_file}")
+            process_song(input_file, output_dir, accompaniment_style, genre)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,8 @@
+"""
+Main entry point for the MusicMidi application.
+"""
+
+from src.midi_generator import main
+
+if __name__ == '__main__':
+    main()